@@ -1,7 +1,8 @@
+from collections import defaultdict
+
 import networkx as nx
 import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
 
 # 交互式可视化库
 try:
@@ -14,6 +15,7 @@ except ImportError:
     print("警告：未安装plotly库。请运行 'pip install plotly' 安装交互式可视化支持。")
     print("将使用matplotlib作为替代方案...")
     import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
     PLOTLY_AVAILABLE = False
 
 # 1. 数据准备 (与之前相同)
@@ -269,11 +271,9 @@ data = {
 G = nx.Graph()
 
 # 添加卫星节点
-sat_nodes_list = []
 for sat in data['sat_attrs']:
     node_id = f"s{sat['id']}"
     G.add_node(node_id, type='satellite', health=sat['health'], pos=np.array(sat['pos']))
-    sat_nodes_list.append(node_id)
 
 # 添加目标节点
 for edge in data['target_edges']:
@@ -289,49 +289,123 @@ for edge in data['target_edges']:
     if f"s{edge['from']}" in G and f"t{edge['to']}" in G:
         G.add_edge(f"s{edge['from']}", f"t{edge['to']}", weight=1.0 / (edge['q'] + 1e-6), type='target_link')
 
+# 节点类型和属性：一次遍历同时得到卫星与目标节点列表，后续统计直接复用
+node_types = nx.get_node_attributes(G, 'type')
+sat_nodes_list, target_nodes = [], []
+for node, node_type in node_types.items():
+    (sat_nodes_list if node_type == 'satellite' else target_nodes).append(node)
+n_sat_nodes, n_target_nodes = len(sat_nodes_list), len(target_nodes)
+
+# 卫星属性一次性汇总为数组（SoA），布局和绘图阶段直接复用，避免反复查询节点字典
+sat_health = np.fromiter((G.nodes[node]['health'] for node in sat_nodes_list),
+                         dtype=np.float64, count=n_sat_nodes)
+sat_3d_pos = np.array([G.nodes[node]['pos'] for node in sat_nodes_list])
+
 # 删除簇相关内容，直接进行交互式可视化
 
 # 5. 交互式可视化准备
 # === 基于物理位置的布局 ===
-# 提取所有卫星的3D坐标
-sat_3d_pos = np.array([G.nodes[node]['pos'] for node in sat_nodes_list])
+# 所有卫星的3D坐标即 sat_3d_pos
+
+# 使用PCA将3D坐标降至2D：矩阵很小，直接对中心化坐标做SVD取前两个主成分
+sat_3d_centered = sat_3d_pos - sat_3d_pos.mean(axis=0)
+_, _, vt = np.linalg.svd(sat_3d_centered, full_matrices=False)
+sat_2d_pos_transformed = sat_3d_centered @ vt[:2].T
+
 
-# 使用PCA将3D坐标降至2D
-pca = PCA(n_components=2)
-sat_2d_pos_transformed = pca.fit_transform(sat_3d_pos)
 
-# 创建一个只包含卫星2D位置的初始布局字典
-pos_init = {node: sat_2d_pos_transformed[i] for i, node in enumerate(sat_nodes_list)}
+def spring_layout_csr(adj, pos_init, k, iterations=50, threshold=1e-4):
+    """基于CSR邻接矩阵的Fruchterman-Reingold布局，与 nx.spring_layout 的迭代规则一致
+
+    引力项直接遍历CSR的 indptr/indices/data 连续数组计算，斥力项为向量化的稠密计算。
+
+    Args:
+        adj (scipy.sparse.csr_array): 邻接矩阵，data 为边权重
+        pos_init (np.ndarray): 初始坐标，形状 (n, 2)
+        k (float): 节点间最优距离
+        iterations (int): 最大迭代次数
+        threshold (float): 平均位移小于该值时提前结束
+
+    Returns:
+        np.ndarray: 归一化后的节点坐标，形状 (n, 2)
+    """
+    n = adj.shape[0]
+    pos = np.array(pos_init, dtype=np.float64)
+    rows = np.repeat(np.arange(n), np.diff(adj.indptr))
+    cols = adj.indices
+    weights = adj.data
+    t = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        # 斥力：所有节点对
+        delta = pos[:, np.newaxis, :] - pos[np.newaxis, :, :]
+        distance = np.linalg.norm(delta, axis=-1)
+        np.clip(distance, 0.01, None, out=distance)
+        displacement = np.einsum("ijk,ij->ik", delta, k * k / distance**2)
+        # 引力：仅沿CSR中的边
+        edge_delta = delta[rows, cols]
+        edge_force = weights * distance[rows, cols] / k
+        np.add.at(displacement, rows, -edge_delta * edge_force[:, np.newaxis])
+
+        length = np.linalg.norm(displacement, axis=-1)
+        length = np.where(length < 0.01, 0.1, length)
+        delta_pos = displacement * (t / length)[:, np.newaxis]
+        pos += delta_pos
+        t -= dt
+        if np.linalg.norm(delta_pos) / n < threshold:
+            break
+    return nx.rescale_layout(pos)
+
 
 # 首先只布局卫星节点，大幅增大k值让卫星最大程度分散
-sat_subgraph = G.subgraph(sat_nodes_list)
-pos_sat_only = nx.spring_layout(sat_subgraph, pos=pos_init, k=400, iterations=2000, seed=42)
+# 卫星间邻接关系一次性转为CSR，布局迭代直接访问连续数组而非NetworkX的嵌套字典
+sat_adj = nx.to_scipy_sparse_array(G, nodelist=sat_nodes_list, weight='weight', format='csr')
+sat_2d_layout = spring_layout_csr(sat_adj, sat_2d_pos_transformed, k=400, iterations=2000)
+pos_sat_only = dict(zip(sat_nodes_list, sat_2d_layout))
 
 # 为所有节点创建位置字典，先放入卫星位置
 pos = {}
 for sat_node in sat_nodes_list:
     pos[sat_node] = pos_sat_only[sat_node]
 
-# 节点类型和属性
-node_types = nx.get_node_attributes(G, 'type')
-
 # 计算卫星网络的边界范围
-sat_positions = np.array([pos[sat] for sat in sat_nodes_list])
+# 中心与半径只依赖坐标集合，直接堆叠布局结果即可
+sat_positions = np.array(list(pos_sat_only.values()))
 sat_center = np.mean(sat_positions, axis=0)
-sat_radius = np.max([np.linalg.norm(pos[sat] - sat_center) for sat in sat_nodes_list])
+sat_radius = np.linalg.norm(sat_positions - sat_center, axis=1).max()
 
 # 为每个目标节点手动分配位置，减少距离让它们更接近卫星
-target_nodes = [node for node in G.nodes() if node_types[node] == 'target']
 outer_radius = sat_radius + 1.2  # 在卫星网络外围1.2个单位
 
 # 将所有目标节点均匀分布在外围圆周上
-for i, target_node in enumerate(target_nodes):
-    angle = (i * 2 * np.pi) / len(target_nodes)
-    direction = np.array([np.cos(angle), np.sin(angle)])
-    pos[target_node] = sat_center + direction * outer_radius
+angles = np.linspace(0, 2 * np.pi, len(target_nodes), endpoint=False)
+ring = sat_center + outer_radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+pos.update(zip(target_nodes, ring))
 
 # 为每个节点分配唯一颜色（用于其出边）- 降低饱和度的版本
 all_nodes = list(G.nodes())
+
+# 所有节点坐标汇总为连续数组，边坐标通过下标批量索引获取
+node_idx = {node: i for i, node in enumerate(all_nodes)}
+pos_arr = np.array([pos[node] for node in all_nodes])
+
+
+def edge_endpoints(edges):
+    """返回边两端点的坐标数组，形状均为 (E, 2)"""
+    src = np.array([node_idx[edge[0]] for edge in edges], dtype=np.intp)
+    dst = np.array([node_idx[edge[1]] for edge in edges], dtype=np.intp)
+    return pos_arr[src], pos_arr[dst]
+
+
+def edge_line_xy(edges):
+    """将一组边拼接为以NaN分隔的折线坐标，可直接交给单个 go.Scatter 绘制"""
+    p0, p1 = edge_endpoints(edges)
+    edge_x = np.empty(3 * len(edges))
+    edge_y = np.empty(3 * len(edges))
+    edge_x[0::3], edge_x[1::3], edge_x[2::3] = p0[:, 0], p1[:, 0], np.nan
+    edge_y[0::3], edge_y[1::3], edge_y[2::3] = p0[:, 1], p1[:, 1], np.nan
+    return edge_x, edge_y
+
 def reduce_saturation(hex_color, saturation_factor=0.6):
     """降低颜色饱和度"""
     # 处理不同的颜色格式
@@ -362,6 +436,14 @@ def reduce_saturation(hex_color, saturation_factor=0.6):
     rgb_new = colorsys.hsv_to_rgb(h, s, v)
     return '#{:02x}{:02x}{:02x}'.format(int(rgb_new[0]*255), int(rgb_new[1]*255), int(rgb_new[2]*255))
 
+def reduce_saturation_batch(rgb, saturation_factor=0.6):
+    """批量降低颜色饱和度，rgb 为 (N, 3) 的 0-1 浮点数组，返回十六进制颜色列表"""
+    import matplotlib.colors as mcolors
+    hsv = mcolors.rgb_to_hsv(np.asarray(rgb, dtype=np.float64))
+    hsv[:, 1] *= saturation_factor
+    rgb_u8 = (mcolors.hsv_to_rgb(hsv) * 255).astype(np.uint8)
+    return ['#{:02x}{:02x}{:02x}'.format(*c) for c in rgb_u8.tolist()]
+
 if PLOTLY_AVAILABLE:
     px_colors = px.colors.qualitative.Set1 + px.colors.qualitative.Set2 + px.colors.qualitative.Set3
     node_edge_color_map = {}
@@ -369,106 +451,76 @@ if PLOTLY_AVAILABLE:
         original_color = px_colors[i % len(px_colors)]
         node_edge_color_map[node] = reduce_saturation(original_color, 0.5)
 else:
-    import matplotlib.colors as mcolors
-    node_colors_for_edges = plt.cm.get_cmap('tab20', len(all_nodes))
-    node_edge_color_map = {}
-    for i, node in enumerate(all_nodes):
-        original_color = mcolors.to_hex(node_colors_for_edges(i))
-        node_edge_color_map[node] = reduce_saturation(original_color, 0.5)
+    import matplotlib
+    node_colors_for_edges = matplotlib.colormaps['tab20'].resampled(len(all_nodes))
+    rgb = node_colors_for_edges(np.arange(len(all_nodes)))[:, :3]
+    node_edge_color_map = dict(zip(all_nodes, reduce_saturation_batch(rgb, 0.5)))
 
 # 6. 创建可视化图表
-# 准备边数据
-sat_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'sat_link']
-target_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'target_link']
+# 准备边数据：一次遍历按类型和源节点分组，每个卫星的出边用不同颜色
+sat_edges_by_source = defaultdict(list)
+target_edges_by_source = defaultdict(list)
+for u, v, attr in G.edges(data=True):
+    (sat_edges_by_source if attr['type'] == 'sat_link' else target_edges_by_source)[u].append((u, v))
+n_sat_edges = sum(map(len, sat_edges_by_source.values()))
+n_target_edges = sum(map(len, target_edges_by_source.values()))
 
 if PLOTLY_AVAILABLE:
     # 使用plotly创建交互式图表
-    fig = go.Figure()
+    # 轨迹以普通字典构造并汇总到 traces，最后一次性创建 Figure：
+    # 省去逐个 go.Scatter 对象的属性校验，也避免多次 add_trace 重建轨迹元组
+    traces = []
     
     # 按源节点分组绘制卫星间边，每个卫星用不同颜色
-    sat_edges_by_source = {}
-    for edge in sat_edges:
-        source = edge[0]
-        if source not in sat_edges_by_source:
-            sat_edges_by_source[source] = []
-        sat_edges_by_source[source].append(edge)
     for source_node, edges in sat_edges_by_source.items():
-        edge_x = []
-        edge_y = []
-        for edge in edges:
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        edge_x, edge_y = edge_line_xy(edges)
         node_label = source_node.replace('s1', '')
-        fig.add_trace(go.Scatter(x=edge_x, y=edge_y,
-                                 line=dict(width=2, color=node_edge_color_map[source_node]),
-                                 hoverinfo='none',
-                                 mode='lines',
-                                 name=f'卫星{node_label}间连接',
-                                 showlegend=False))
+        traces.append(dict(type='scatter', x=edge_x, y=edge_y,
+                           line=dict(width=2, color=node_edge_color_map[source_node]),
+                           hoverinfo='none',
+                           mode='lines',
+                           name=f'卫星{node_label}间连接',
+                           showlegend=False))
     
     # 按源节点分组绘制卫星-目标边，每个卫星用不同颜色
-    target_edges_by_source = {}
-    for edge in target_edges:
-        source = edge[0]
-        if source not in target_edges_by_source:
-            target_edges_by_source[source] = []
-        target_edges_by_source[source].append(edge)
     for source_node, edges in target_edges_by_source.items():
-        edge_x = []
-        edge_y = []
-        for edge in edges:
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        edge_x, edge_y = edge_line_xy(edges)
         node_label = source_node.replace('s1', '')
-        fig.add_trace(go.Scatter(x=edge_x, y=edge_y,
-                                 line=dict(width=1.5, color=node_edge_color_map[source_node], dash='dash'),
-                                 hoverinfo='none',
-                                 mode='lines',
-                                 name=f'卫星{node_label}目标连接',
-                                 showlegend=False))
+        traces.append(dict(type='scatter', x=edge_x, y=edge_y,
+                           line=dict(width=1.5, color=node_edge_color_map[source_node], dash='dash'),
+                           hoverinfo='none',
+                           mode='lines',
+                           name=f'卫星{node_label}目标连接',
+                           showlegend=False))
     
     # 添加卫星节点
-    sat_node_x = []
-    sat_node_y = []
-    sat_node_text = []
-    sat_node_sizes = []
-    sat_node_colors = []
-    sat_node_hover = []
+    sat_node_x = [pos[node][0] for node in sat_nodes_list]
+    sat_node_y = [pos[node][1] for node in sat_nodes_list]
+    # 简化节点标签
+    sat_node_text = [node.replace('s1', '') for node in sat_nodes_list]
+    # 悬停文本直接基于 SoA 数组格式化，坐标先转为 Python float 列表再统一格式化
+    pos_strs = [f"[{x:.1f}, {y:.1f}, {z:.1f}]" for x, y, z in sat_3d_pos.tolist()]
+    sat_node_hover = [f'卫星 {node_label}<br>健康度: {health:.2f}<br>位置: {pos_str}'
+                      for node_label, health, pos_str in zip(sat_node_text, sat_health.tolist(), pos_strs)]
+    # 根据健康度设置大小和颜色
+    sat_node_sizes = (sat_health * 30 + 15).tolist()  # 大小范围15-45
+    sat_node_colors = sat_health.tolist()  # 颜色基于健康度
     
-    for node in sat_nodes_list:
-        x, y = pos[node]
-        sat_node_x.append(x)
-        sat_node_y.append(y)
-        # 简化节点标签
-        node_label = node.replace('s1', '')
-        sat_node_text.append(node_label)
-        pos_str = f"[{G.nodes[node]['pos'][0]:.1f}, {G.nodes[node]['pos'][1]:.1f}, {G.nodes[node]['pos'][2]:.1f}]"
-        node_text = f'卫星 {node_label}<br>健康度: {G.nodes[node]["health"]:.2f}<br>位置: {pos_str}'
-        sat_node_hover.append(node_text)
-        # 根据健康度设置大小和颜色
-        health = G.nodes[node]['health']
-        sat_node_sizes.append(health * 30 + 15)  # 大小范围15-45
-        sat_node_colors.append(health)  # 颜色基于健康度
-    
-    fig.add_trace(go.Scatter(x=sat_node_x, y=sat_node_y,
-                              mode='markers+text',
-                              marker=dict(size=sat_node_sizes,
-                                        color=sat_node_colors,
-                                        colorscale='Viridis',
-                                        line=dict(width=3, color='white'),
-                                        showscale=True,
-                                        colorbar=dict(title="健康度")),
-                              text=sat_node_text,
-                              textposition="middle center",
-                              textfont=dict(size=10, color='white', family='Arial Black'),
-                              hovertext=sat_node_hover,
-                              hoverinfo='text',
-                              name='卫星节点',
-                              showlegend=True))
+    traces.append(dict(type='scatter', x=sat_node_x, y=sat_node_y,
+                       mode='markers+text',
+                       marker=dict(size=sat_node_sizes,
+                                   color=sat_node_colors,
+                                   colorscale='Viridis',
+                                   line=dict(width=3, color='white'),
+                                   showscale=True,
+                                   colorbar=dict(title="健康度")),
+                       text=sat_node_text,
+                       textposition="middle center",
+                       textfont=dict(size=10, color='white', family='Arial Black'),
+                       hovertext=sat_node_hover,
+                       hoverinfo='text',
+                       name='卫星节点',
+                       showlegend=True))
     
     # 添加目标节点
     target_node_x = []
@@ -483,18 +535,20 @@ if PLOTLY_AVAILABLE:
         target_node_text.append(f'目标 {node.replace("t", "T")}')
         target_node_ids.append(node)
     
-    fig.add_trace(go.Scatter(x=target_node_x, y=target_node_y,
-                             mode='markers+text',
-                             marker=dict(size=20,
-                                       color='#D3D3D3',  # 降低饱和度的浅灰色
-                                       symbol='square',
-                                       line=dict(width=2, color='#696969')),
-                             text=[node.replace('t', 'T') for node in target_nodes],
-                             textposition="middle center",
-                             textfont=dict(size=8, color='black'),
-                             hovertext=target_node_text,
-                             hoverinfo='text',
-                             name='目标节点'))
+    traces.append(dict(type='scatter', x=target_node_x, y=target_node_y,
+                       mode='markers+text',
+                       marker=dict(size=20,
+                                   color='#D3D3D3',  # 降低饱和度的浅灰色
+                                   symbol='square',
+                                   line=dict(width=2, color='#696969')),
+                       text=[node.replace('t', 'T') for node in target_nodes],
+                       textposition="middle center",
+                       textfont=dict(size=8, color='black'),
+                       hovertext=target_node_text,
+                       hoverinfo='text',
+                       name='目标节点'))
+    
+    fig = go.Figure(data=traces, skip_invalid=True)
     
     # 设置布局 - 去除网格和背景，纯白
     fig.update_layout(
@@ -568,11 +622,9 @@ if PLOTLY_AVAILABLE:
         'plotlyServerURL': "https://plot.ly"
     })
     
-    # 仅保存静态HTML（无交互高亮）
-    html_template = fig.to_html(full_html=True, include_plotlyjs='cdn')
+    # 仅保存静态HTML（无交互高亮），直接写入文件，不在内存中保留整份HTML字符串
     html_filename = "卫星网络交互式图表.html"
-    with open(html_filename, 'w', encoding='utf-8') as f:
-        f.write(html_template)
+    fig.write_html(html_filename, include_plotlyjs='cdn', full_html=True)
     
     print("🎉 交互式图表已显示！")
     print("📋 完整功能列表：")
@@ -591,25 +643,24 @@ else:
     plt.rcParams['font.sans-serif'] = ['SimHei']
     plt.rcParams['axes.unicode_minus'] = False
     
-    # 绘制边 - 使用彩色连接，降低透明度
-    for edge in sat_edges:
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        source_node = edge[0]
-        plt.plot([x0, x1], [y0, y1], color=node_edge_color_map[source_node], 
-                alpha=0.6, linewidth=2)  # 降低透明度
+    # 绘制边 - 使用彩色连接，降低透明度；每类边合并为一个LineCollection一次绘制
+    ax = plt.gca()
+    if n_sat_edges:
+        sat_edges = [edge for edges in sat_edges_by_source.values() for edge in edges]
+        segs = np.stack(edge_endpoints(sat_edges), axis=1)
+        cols = [node_edge_color_map[edge[0]] for edge in sat_edges]
+        ax.add_collection(LineCollection(segs, colors=cols, linewidths=2, alpha=0.6))  # 降低透明度
     
-    for edge in target_edges:
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        source_node = edge[0]
-        plt.plot([x0, x1], [y0, y1], color=node_edge_color_map[source_node], 
-                linestyle='--', alpha=0.5, linewidth=1.5)  # 降低透明度
+    if n_target_edges:
+        target_edges = [edge for edges in target_edges_by_source.values() for edge in edges]
+        segs = np.stack(edge_endpoints(target_edges), axis=1)
+        cols = [node_edge_color_map[edge[0]] for edge in target_edges]
+        ax.add_collection(LineCollection(segs, colors=cols, linewidths=1.5,
+                                         linestyles='--', alpha=0.5))  # 降低透明度
     
     # 绘制卫星节点 - 使用与边匹配的颜色，降低透明度
-    for node in sat_nodes_list:
+    for node, health in zip(sat_nodes_list, sat_health):
         x, y = pos[node]
-        health = G.nodes[node]['health']
         plt.scatter(x, y, s=health*400, c=node_edge_color_map[node], 
                    alpha=0.8, edgecolors='white', linewidth=3)  # 稍微降低透明度
         plt.text(x, y, node.replace('s1', ''), ha='center', va='center', 
@@ -636,8 +687,8 @@ else:
 
 # 显示网络信息
 print("卫星网络可视化完成")
-print(f"卫星节点数: {len([n for n in G.nodes() if node_types[n] == 'satellite'])}")
-print(f"目标节点数: {len([n for n in G.nodes() if node_types[n] == 'target'])}")
-print(f"卫星间连接数: {len(sat_edges)}")
-print(f"卫星-目标连接数: {len(target_edges)}")
+print(f"卫星节点数: {n_sat_nodes}")
+print(f"目标节点数: {n_target_nodes}")
+print(f"卫星间连接数: {n_sat_edges}")
+print(f"卫星-目标连接数: {n_target_edges}")
 
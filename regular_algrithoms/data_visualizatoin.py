@@ -1,500 +1,530 @@
+import os
+import json
 import networkx as nx
 import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
-import dash
-from dash import dcc, html, Input, Output
-
-# 交互式可视化库
+# 作为包内模块导入（如从仓库根目录 import regular_algrithoms.data_visualizatoin）时用相对导入，
+# 直接运行本脚本时没有父包，退回按同目录模块导入
 try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    from plotly.subplots import make_subplots
-    import colorsys
-    PLOTLY_AVAILABLE = True
+    from .graph_kernels import edge_line_xy
 except ImportError:
-    print("警告：未安装plotly库。请运行 'pip install plotly' 安装交互式可视化支持。")
-    print("将使用matplotlib作为替代方案...")
-    import matplotlib.pyplot as plt
-    PLOTLY_AVAILABLE = False
-
-# 1. 数据准备 (与之前相同)
-data = {
-    "timestamp": "2025-06-06T04:13:20Z",
-    "strategy": "balance",
-    "sat_attrs": [{"id": 111, "health": 0.9, "pos": [2939.107, 5581.72, 4719.226]},
-                  {"id": 112, "health": 0.64, "pos": [-3334.036, 1397.035, 6999.824]},
-                  {"id": 113, "health": 0.5, "pos": [-6273.143, -4184.685, 2280.598]},
-                  {"id": 114, "health": 0.56, "pos": [-2939.107, -5581.72, -4719.226]},
-                  {"id": 115, "health": 1.0, "pos": [3334.036, -1397.035, -6999.824]},
-                  {"id": 116, "health": 0.71, "pos": [6273.143, 4184.685, -2280.598]},
-                  {"id": 121, "health": 0.73, "pos": [-3552.798, 4281.259, 5577.947]},
-                  {"id": 122, "health": 0.91, "pos": [-2447.011, -3445.004, 6648.995]},
-                  {"id": 123, "health": 1.0, "pos": [1105.787, -7726.263, 1071.048]},
-                  {"id": 124, "health": 0.68, "pos": [3552.798, -4281.259, -5577.947]},
-                  {"id": 126, "health": 0.82, "pos": [-1105.787, 7726.263, -1071.048]},
-                  {"id": 131, "health": 0.51, "pos": [-4498.06, -1598.404, 6267.184]},
-                  {"id": 132, "health": 0.68, "pos": [3009.285, -3980.747, 6096.139]},
-                  {"id": 133, "health": 0.72, "pos": [7507.345, -2382.343, -171.046]},
-                  {"id": 134, "health": 0.33, "pos": [4498.06, 1598.404, -6267.184]},
-                  {"id": 135, "health": 0.59, "pos": [-3009.285, 3980.747, -6096.139]},
-                  {"id": 141, "health": 0.94, "pos": [228.012, -4029.186, 6765.997]},
-                  {"id": 142, "health": 0.75, "pos": [5546.708, 1609.45, 5358.054]},
-                  {"id": 143, "health": 0.63, "pos": [5318.696, 5638.636, -1407.942]},
-                  {"id": 151, "health": 0.89, "pos": [3463.991, -482.812, 7059.228]},
-                  {"id": 152, "health": 0.69, "pos": [774.356, 6449.734, 4457.168]},
-                  {"id": 153, "health": 1.0, "pos": [-2689.635, 6932.546, -2602.059]},
-                  {"id": 155, "health": 0.78, "pos": [-774.356, -6449.734, -4457.168]},
-                  {"id": 156, "health": 1.0, "pos": [2689.635, -6932.546, 2602.059]},
-                  {"id": 161, "health": 0.52, "pos": [859.545, 3221.124, 7137.968]},
-                  {"id": 164, "health": 0.69, "pos": [-859.545, -3221.124, -7137.968]},
-                  {"id": 166, "health": 0.81, "pos": [6931.324, -452.607, 3717.114]}],
-    "sat_edges": [{"from": 111, "to": 112, "w": 0.25}, {"from": 111, "to": 116, "w": 0.25},
-                  {"from": 111, "to": 121, "w": 0.29}, {"from": 111, "to": 126, "w": 0.26},
-                  {"from": 111, "to": 142, "w": 0.41}, {"from": 111, "to": 143, "w": 0.3},
-                  {"from": 111, "to": 151, "w": 0.3}, {"from": 111, "to": 152, "w": 0.83},
-                  {"from": 111, "to": 161, "w": 0.49}, {"from": 111, "to": 166, "w": 0.27},
-                  {"from": 112, "to": 111, "w": 0.25}, {"from": 112, "to": 113, "w": 0.25},
-                  {"from": 112, "to": 121, "w": 0.6}, {"from": 112, "to": 122, "w": 0.39},
-                  {"from": 112, "to": 131, "w": 0.59}, {"from": 112, "to": 132, "w": 0.23},
-                  {"from": 112, "to": 136, "w": 0.24}, {"from": 112, "to": 141, "w": 0.3},
-                  {"from": 112, "to": 142, "w": 0.22}, {"from": 112, "to": 146, "w": 0.21},
-                  {"from": 112, "to": 151, "w": 0.28}, {"from": 112, "to": 152, "w": 0.28},
-                  {"from": 112, "to": 161, "w": 0.43}, {"from": 112, "to": 162, "w": 0.39},
-                  {"from": 113, "to": 112, "w": 0.25}, {"from": 113, "to": 114, "w": 0.25},
-                  {"from": 113, "to": 122, "w": 0.33}, {"from": 113, "to": 123, "w": 0.24},
-                  {"from": 113, "to": 131, "w": 0.38}, {"from": 113, "to": 136, "w": 0.28},
-                  {"from": 113, "to": 141, "w": 0.25}, {"from": 113, "to": 145, "w": 0.24},
-                  {"from": 113, "to": 146, "w": 1.0}, {"from": 113, "to": 155, "w": 0.22},
-                  {"from": 113, "to": 162, "w": 0.24}, {"from": 113, "to": 163, "w": 0.26},
-                  {"from": 114, "to": 113, "w": 0.25}, {"from": 114, "to": 115, "w": 0.25},
-                  {"from": 114, "to": 123, "w": 0.26}, {"from": 114, "to": 124, "w": 0.29},
-                  {"from": 114, "to": 145, "w": 0.41}, {"from": 114, "to": 146, "w": 0.3},
-                  {"from": 114, "to": 154, "w": 0.3}, {"from": 114, "to": 155, "w": 0.83},
-                  {"from": 114, "to": 163, "w": 0.27}, {"from": 114, "to": 164, "w": 0.49},
-                  {"from": 115, "to": 114, "w": 0.25}, {"from": 115, "to": 116, "w": 0.25},
-                  {"from": 115, "to": 124, "w": 0.6}, {"from": 115, "to": 125, "w": 0.39},
-                  {"from": 115, "to": 133, "w": 0.24}, {"from": 115, "to": 134, "w": 0.59},
-                  {"from": 115, "to": 135, "w": 0.23}, {"from": 115, "to": 143, "w": 0.21},
-                  {"from": 115, "to": 144, "w": 0.3}, {"from": 115, "to": 145, "w": 0.22},
-                  {"from": 115, "to": 154, "w": 0.28}, {"from": 115, "to": 155, "w": 0.28},
-                  {"from": 115, "to": 164, "w": 0.43}, {"from": 115, "to": 165, "w": 0.39},
-                  {"from": 116, "to": 111, "w": 0.25}, {"from": 116, "to": 115, "w": 0.25},
-                  {"from": 116, "to": 125, "w": 0.33}, {"from": 116, "to": 126, "w": 0.24},
-                  {"from": 116, "to": 133, "w": 0.28}, {"from": 116, "to": 134, "w": 0.38},
-                  {"from": 116, "to": 142, "w": 0.24}, {"from": 116, "to": 143, "w": 1.0},
-                  {"from": 116, "to": 144, "w": 0.25}, {"from": 116, "to": 152, "w": 0.22},
-                  {"from": 116, "to": 165, "w": 0.24}, {"from": 116, "to": 166, "w": 0.26},
-                  {"from": 121, "to": 111, "w": 0.29}, {"from": 121, "to": 112, "w": 0.6},
-                  {"from": 121, "to": 122, "w": 0.25}, {"from": 121, "to": 126, "w": 0.25},
-                  {"from": 121, "to": 131, "w": 0.32}, {"from": 121, "to": 136, "w": 0.28},
-                  {"from": 121, "to": 141, "w": 0.21}, {"from": 121, "to": 151, "w": 0.23},
-                  {"from": 121, "to": 152, "w": 0.39}, {"from": 121, "to": 153, "w": 0.23},
-                  {"from": 121, "to": 161, "w": 0.41}, {"from": 121, "to":162, "w": 0.58},
-                  {"from": 122, "to": 112, "w": 0.39}, {"from": 122, "to": 113, "w": 0.33},
-                  {"from": 122, "to": 121, "w": 0.25}, {"from": 122, "to": 123, "w": 0.25},
-                  {"from": 122, "to": 131, "w": 0.7}, {"from": 122, "to": 132, "w": 0.35},
-                  {"from": 122, "to": 141, "w": 0.71}, {"from": 122, "to": 146, "w": 0.31},
-                  {"from": 122, "to": 151, "w": 0.29}, {"from": 122, "to": 156, "w": 0.26},
-                  {"from": 122, "to": 161, "w": 0.26}, {"from": 122, "to": 162, "w": 0.23},
-                  {"from": 123, "to": 113, "w": 0.24}, {"from": 123, "to": 114, "w": 0.26},
-                  {"from": 123, "to": 122, "w": 0.25}, {"from": 123, "to": 124, "w": 0.25},
-                  {"from": 123, "to": 132, "w": 0.3}, {"from": 123, "to": 133, "w": 0.23},
-                  {"from": 123, "to": 141, "w": 0.28}, {"from": 123, "to": 146, "w": 0.29},
-                  {"from": 123, "to": 155, "w": 0.33}, {"from": 123, "to": 156, "w": 0.83},
-                  {"from": 123, "to": 165, "w": 0.25}, {"from": 124, "to": 114, "w": 0.29},
-                  {"from": 124, "to": 115, "w": 0.6}, {"from": 124, "to": 123, "w": 0.25},
-                  {"from": 124, "to": 125, "w": 0.25}, {"from": 124, "to": 133, "w": 0.28},
-                  {"from": 124, "to": 134, "w": 0.32}, {"from": 124, "to": 144, "w": 0.21},
-                  {"from": 124, "to": 154, "w": 0.23}, {"from": 124, "to": 155, "w": 0.39},
-                  {"from": 124, "to": 156, "w": 0.23}, {"from": 124, "to": 164, "w": 0.41},
-                  {"from": 124, "to": 165, "w": 0.58}, {"from": 126, "to": 111, "w": 0.26},
-                  {"from": 126, "to": 116, "w": 0.24}, {"from": 126, "to": 121, "w": 0.25},
-                  {"from": 126, "to": 125, "w": 0.25}, {"from": 126, "to": 135, "w": 0.3},
-                  {"from": 126, "to": 136, "w": 0.23}, {"from": 126, "to": 143, "w": 0.29},
-                  {"from": 126, "to": 144, "w": 0.28}, {"from": 126, "to": 152, "w": 0.33},
-                  {"from": 126, "to": 153, "w": 0.83}, {"from": 126, "to": 162, "w": 0.25},
-                  {"from": 131, "to": 112, "w": 0.59}, {"from": 131, "to": 113, "w": 0.38},
-                  {"from": 131, "to": 121, "w": 0.32}, {"from": 131, "to": 122, "w": 0.7},
-                  {"from": 131, "to": 132, "w": 0.25}, {"from": 131, "to": 136, "w": 0.25},
-                  {"from": 131, "to": 141, "w": 0.36}, {"from": 131, "to": 146, "w": 0.31},
-                  {"from": 131, "to": 151, "w": 0.24}, {"from": 131, "to": 161, "w": 0.27},
-                  {"from": 131, "to": 162, "w": 0.31}, {"from": 132, "to": 112, "w": 0.23},
-                  {"from": 132, "to": 122, "w": 0.35}, {"from": 132, "to": 123, "w": 0.3},
-                  {"from": 132, "to": 131, "w": 0.25}, {"from": 132, "to": 133, "w": 0.25},
-                  {"from": 132, "to": 141, "w": 0.68}, {"from": 132, "to": 142, "w": 0.31},
-                  {"from": 132, "to": 151, "w": 0.53}, {"from": 132, "to": 156, "w": 0.42},
-                  {"from": 132, "to": 161, "w": 0.26}, {"from": 132, "to": 166, "w": 0.34},
-                  {"from": 133, "to": 115, "w": 0.24}, {"from": 133, "to": 116, "w": 0.28},
-                  {"from": 133, "to": 123, "w": 0.23}, {"from": 133, "to": 124, "w": 0.28},
-                  {"from": 133, "to": 132, "w": 0.25}, {"from": 133, "to": 134, "w": 0.25},
-                  {"from": 133, "to": 142, "w": 0.27}, {"from": 133, "to": 143, "w": 0.23},
-                  {"from": 133, "to": 151, "w": 0.23}, {"from": 133, "to": 156, "w": 0.27},
-                  {"from": 133, "to": 165, "w": 0.51}, {"from": 133, "to": 166, "w": 0.44},
-                  {"from": 134, "to": 115, "w": 0.59}, {"from": 134, "to": 116, "w": 0.38},
-                  {"from": 134, "to": 124, "w": 0.32}, {"from": 134, "to": 125, "w": 0.7},
-                  {"from": 134, "to": 133, "w": 0.25}, {"from": 134, "to": 135, "w": 0.25},
-                  {"from": 134, "to": 143, "w": 0.31}, {"from": 134, "to": 144, "w": 0.36},
-                  {"from": 134, "to": 154, "w": 0.24}, {"from": 134, "to": 164, "w": 0.27},
-                  {"from": 134, "to": 165, "w": 0.31}, {"from": 135, "to": 115, "w": 0.23},
-                  {"from": 135, "to": 125, "w": 0.35}, {"from": 135, "to": 126, "w": 0.3},
-                  {"from": 135, "to": 134, "w": 0.25}, {"from": 135, "to": 136, "w": 0.25},
-                  {"from": 135, "to": 144, "w": 0.68}, {"from": 135, "to": 145, "w": 0.31},
-                  {"from": 135, "to": 153, "w": 0.42}, {"from": 135, "to": 154, "w": 0.53},
-                  {"from": 135, "to": 163, "w": 0.34}, {"from": 135, "to": 164, "w": 0.26},
-                  {"from": 141, "to": 112, "w": 0.3}, {"from": 141, "to": 113, "w": 0.25},
-                  {"from": 141, "to": 121, "w": 0.21}, {"from": 141, "to": 122, "w": 0.71},
-                  {"from": 141, "to": 123, "w": 0.28}, {"from": 141, "to": 131, "w": 0.36},
-                  {"from": 141, "to": 132, "w": 0.68}, {"from": 141, "to": 142, "w": 0.25},
-                  {"from": 141, "to": 146, "w": 0.25}, {"from": 141, "to": 151, "w": 0.4},
-                  {"from": 141, "to": 156, "w": 0.34}, {"from": 141, "to": 161, "w": 0.27},
-                  {"from": 141, "to": 166, "w": 0.24}, {"from": 142, "to": 111, "w": 0.41},
-                  {"from": 142, "to": 112, "w": 0.22}, {"from": 142, "to": 116, "w": 0.24},
-                  {"from": 142, "to": 132, "w": 0.31}, {"from": 142, "to": 133, "w": 0.27},
-                  {"from": 142, "to": 141, "w": 0.25}, {"from": 142, "to": 143, "w": 0.25},
-                  {"from": 142, "to": 151, "w": 0.57}, {"from": 142, "to": 152, "w": 0.28},
-                  {"from": 142, "to": 161, "w": 0.37}, {"from": 142, "to": 166, "w": 0.65},
-                  {"from": 143, "to": 111, "w": 0.3}, {"from": 143, "to": 115, "w": 0.21},
-                  {"from": 143, "to": 116, "w": 1.0}, {"from": 143, "to": 125, "w": 0.31},
-                  {"from": 143, "to": 126, "w": 0.29}, {"from": 143, "to": 133, "w": 0.23},
-                  {"from": 143, "to": 134, "w": 0.31}, {"from": 143, "to": 142, "w": 0.25},
-                  {"from": 143, "to": 144, "w": 0.25}, {"from": 143, "to": 152, "w": 0.26},
-                  {"from": 143, "to": 153, "w": 0.24}, {"from": 143, "to": 166, "w": 0.24},
-                  {"from": 151, "to": 111, "w": 0.3}, {"from": 151, "to": 112, "w": 0.28},
-                  {"from": 151, "to": 121, "w": 0.23}, {"from": 151, "to": 122, "w": 0.29},
-                  {"from": 151, "to": 131, "w": 0.24}, {"from": 151, "to": 132, "w": 0.53},
-                  {"from": 151, "to": 133, "w": 0.23}, {"from": 151, "to": 141, "w": 0.4},
-                  {"from": 151, "to": 142, "w": 0.57}, {"from": 151, "to": 152, "w": 0.25},
-                  {"from": 151, "to": 156, "w": 0.25}, {"from": 151, "to": 161, "w": 0.43},
-                  {"from": 151, "to": 166, "w": 0.4}, {"from": 152, "to": 111, "w": 0.83},
-                  {"from": 152, "to": 112, "w": 0.28}, {"from": 152, "to": 116, "w": 0.22},
-                  {"from": 152, "to": 121, "w": 0.39}, {"from": 152, "to": 126, "w": 0.33},
-                  {"from": 152, "to": 142, "w": 0.28}, {"from": 152, "to": 143, "w": 0.26},
-                  {"from": 152, "to": 151, "w": 0.25}, {"from": 152, "to": 153, "w": 0.25},
-                  {"from": 152, "to": 161, "w": 0.46}, {"from": 152, "to": 162, "w": 0.26},
-                  {"from": 153, "to": 121, "w": 0.23}, {"from": 153, "to": 125, "w": 0.26},
-                  {"from": 153, "to": 126, "w": 0.83}, {"from": 153, "to": 135, "w": 0.42},
-                  {"from": 153, "to": 136, "w": 0.27}, {"from": 153, "to": 143, "w": 0.24},
-                  {"from": 153, "to": 144, "w": 0.34}, {"from": 153, "to": 152, "w": 0.25},
-                  {"from": 153, "to": 154, "w": 0.25}, {"from": 153, "to": 162, "w": 0.25},
-                  {"from": 153, "to": 163, "w": 0.25}, {"from": 155, "to": 113, "w": 0.22},
-                  {"from": 155, "to": 114, "w": 0.83}, {"from": 155, "to": 115, "w": 0.28},
-                  {"from": 155, "to": 123, "w": 0.33}, {"from": 155, "to": 124, "w": 0.39},
-                  {"from": 155, "to": 145, "w": 0.28}, {"from": 155, "to": 146, "w": 0.26},
-                  {"from": 155, "to": 154, "w": 0.25}, {"from": 155, "to": 156, "w": 0.25},
-                  {"from": 155, "to": 164, "w": 0.46}, {"from": 155, "to": 165, "w": 0.26},
-                  {"from": 156, "to": 122, "w": 0.26}, {"from": 156, "to": 123, "w": 0.83},
-                  {"from": 156, "to": 124, "w": 0.23}, {"from": 156, "to": 132, "w": 0.42},
-                  {"from": 156, "to": 133, "w": 0.27}, {"from": 156, "to": 141, "w": 0.34},
-                  {"from": 156, "to": 146, "w": 0.24}, {"from": 156, "to": 151, "w": 0.25},
-                  {"from": 156, "to": 155, "w": 0.25}, {"from": 156, "to": 165, "w": 0.25},
-                  {"from": 156, "to": 166, "w": 0.25}, {"from": 161, "to": 111, "w": 0.49},
-                  {"from": 161, "to": 112, "w": 0.43}, {"from": 161, "to": 121, "w": 0.41},
-                  {"from": 161, "to": 122, "w": 0.26}, {"from": 161, "to": 131, "w": 0.27},
-                  {"from": 161, "to": 132, "w": 0.26}, {"from": 161, "to": 141, "w": 0.27},
-                  {"from": 161, "to": 142, "w": 0.37}, {"from": 161, "to": 151, "w": 0.43},
-                  {"from": 161, "to": 152, "w": 0.46}, {"from": 161, "to": 162, "w": 0.25},
-                  {"from": 161, "to": 166, "w": 0.25}, {"from": 164, "to": 114, "w": 0.49},
-                  {"from": 164, "to": 115, "w": 0.43}, {"from": 164, "to": 124, "w": 0.41},
-                  {"from": 164, "to": 125, "w": 0.26}, {"from": 164, "to": 134, "w": 0.27},
-                  {"from": 164, "to": 135, "w": 0.26}, {"from": 164, "to": 144, "w": 0.27},
-                  {"from": 164, "to": 145, "w": 0.37}, {"from": 164, "to": 154, "w": 0.43},
-                  {"from": 164, "to": 155, "w": 0.46}, {"from": 164, "to": 163, "w": 0.25},
-                  {"from": 164, "to": 165, "w": 0.25}, {"from": 166, "to": 111, "w": 0.27},
-                  {"from": 166, "to": 116, "w": 0.26}, {"from": 166, "to": 132, "w": 0.34},
-                  {"from": 166, "to": 133, "w": 0.44}, {"from": 166, "to": 141, "w": 0.24},
-                  {"from": 166, "to": 142, "w": 0.65}, {"from": 166, "to": 143, "w": 0.24},
-                  {"from": 166, "to": 151, "w": 0.4}, {"from": 166, "to": 156, "w": 0.25},
-                  {"from": 166, "to": 161, "w": 0.25}, {"from": 166, "to": 165, "w": 0.25}],
-    "target_edges": [{"from": 111, "to": 11, "q": 0.17}, {"from": 111, "to": 24, "q": 0.15},
-                     {"from": 111, "to": 25, "q": 0.19}, {"from": 111, "to": 30, "q": 0.15},
-                     {"from": 111, "to": 40, "q": 0.17}, {"from": 111, "to": 44, "q": 0.16},
-                     {"from": 111, "to": 45, "q": 0.15}, {"from": 111, "to": 47, "q": 0.15},
-                     {"from": 111, "to": 48, "q": 1.0}, {"from": 112, "to": 18, "q": 0.2},
-                     {"from": 112, "to": 23, "q": 0.18}, {"from": 112, "to": 33, "q": 0.17},
-                     {"from": 112, "to": 46, "q": 0.21}, {"from": 113, "to": 19, "q": 0.13},
-                     {"from": 113, "to": 37, "q": 0.17}, {"from": 114, "to": 19, "q": 0.14},
-                     {"from": 115, "to": 29, "q": 0.19}, {"from": 116, "to": 11, "q": 0.13},
-                     {"from": 116, "to": 14, "q": 0.13}, {"from": 121, "to": 24, "q": 0.16},
-                     {"from": 121, "to": 25, "q": 0.14}, {"from": 121, "to": 40, "q": 0.15},
-                     {"from": 121, "to": 46, "q": 0.28}, {"from": 122, "to": 13, "q": 0.16},
-                     {"from": 122, "to": 15, "q": 0.13}, {"from": 122, "to": 16, "q": 0.63},
-                     {"from": 122, "to": 18, "q": 0.17}, {"from": 122, "to": 23, "q": 0.25},
-                     {"from": 122, "to": 35, "q": 0.17}, {"from": 122, "to": 50, "q": 0.17},
-                     {"from": 123, "to": 12, "q": 0.13}, {"from": 123, "to": 17, "q": 0.31},
-                     {"from": 123, "to": 26, "q": 0.13}, {"from": 123, "to": 6, "q": 0.14},
-                     {"from": 124, "to": 29, "q": 0.18}, {"from": 124, "to": 7, "q": 0.27},
-                     {"from": 126, "to": 38, "q": 0.18}, {"from": 131, "to": 16, "q": 0.19},
-                     {"from": 131, "to": 23, "q": 0.19}, {"from": 132, "to": 13, "q": 0.17},
-                     {"from": 132, "to": 15, "q": 0.14}, {"from": 132, "to": 26, "q": 0.23},
-                     {"from": 132, "to": 3, "q": 0.42}, {"from": 132, "to": 36, "q": 0.15},
-                     {"from": 132, "to": 43, "q": 0.46}, {"from": 132, "to": 50, "q": 0.23},
-                     {"from": 132, "to": 6, "q": 0.2}, {"from": 132, "to": 8, "q": 0.19},
-                     {"from": 133, "to": 10, "q": 0.18}, {"from": 133, "to": 14, "q": 0.18},
-                     {"from": 134, "to": 29, "q": 0.15}, {"from": 135, "to": 21, "q": 0.13},
-                     {"from": 141, "to": 13, "q": 0.24}, {"from": 141, "to": 15, "q": 0.16},
-                     {"from": 141, "to": 2, "q": 0.17}, {"from": 141, "to": 23, "q": 0.18},
-                     {"from": 141, "to": 26, "q": 0.21}, {"from": 141, "to": 27, "q": 0.13},
-                     {"from": 141, "to": 3, "q": 0.24}, {"from": 141, "to": 34, "q": 0.2},
-                     {"from": 141, "to": 36, "q": 0.17}, {"from": 141, "to": 43, "q": 0.16},
-                     {"from": 141, "to": 49, "q": 0.16}, {"from": 141, "to": 50, "q": 0.48},
-                     {"from": 142, "to": 1, "q": 0.17}, {"from": 142, "to": 10, "q": 0.13},
-                     {"from": 142, "to": 20, "q": 0.23}, {"from": 142, "to": 27, "q": 0.15},
-                     {"from": 142, "to": 30, "q": 0.21}, {"from": 142, "to": 39, "q": 0.15},
-                     {"from": 142, "to": 47, "q": 0.16}, {"from": 143, "to": 11, "q": 0.17},
-                     {"from": 143, "to": 44, "q": 0.19}, {"from": 151, "to": 13, "q": 0.19},
-                     {"from": 151, "to": 15, "q": 0.23}, {"from": 151, "to": 2, "q": 0.18},
-                     {"from": 151, "to": 20, "q": 0.17}, {"from": 151, "to": 3, "q": 0.2},
-                     {"from": 151, "to": 30, "q": 0.21}, {"from": 151, "to": 34, "q": 0.26},
-                     {"from": 151, "to": 36, "q": 0.26}, {"from": 151, "to": 45, "q": 0.14},
-                     {"from": 151, "to": 47, "q": 0.19}, {"from": 151, "to": 49, "q": 0.2},
-                     {"from": 152, "to": 24, "q": 0.34}, {"from": 152, "to": 25, "q": 0.59},
-                     {"from": 152, "to": 33, "q": 0.15}, {"from": 152, "to": 40, "q": 0.2},
-                     {"from": 152, "to": 45, "q": 0.14}, {"from": 152, "to": 46, "q": 0.13},
-                     {"from": 152, "to": 48, "q": 0.22}, {"from": 153, "to": 38, "q": 0.15},
-                     {"from": 155, "to": 7, "q": 0.2}, {"from": 156, "to": 12, "q": 0.19},
-                     {"from": 156, "to": 17, "q": 0.15}, {"from": 156, "to": 26, "q": 0.2},
-                     {"from": 156, "to": 43, "q": 0.17}, {"from": 156, "to": 50, "q": 0.13},
-                     {"from": 156, "to": 6, "q": 0.28}, {"from": 156, "to": 8, "q": 0.14},
-                     {"from": 161, "to": 15, "q": 0.14}, {"from": 161, "to": 24, "q": 0.13},
-                     {"from": 161, "to": 25, "q": 0.15}, {"from": 161, "to": 28, "q": 0.16},
-                     {"from": 161, "to": 30, "q": 0.21}, {"from": 161, "to": 36, "q": 0.14},
-                     {"from": 161, "to": 40, "q": 0.34}, {"from": 161, "to": 46, "q": 0.21},
-                     {"from": 161, "to": 47, "q": 0.31}, {"from": 161, "to": 48, "q": 0.13},
-                     {"from": 164, "to": 7, "q": 0.14}, {"from": 166, "to": 1, "q": 0.18},
-                     {"from": 166, "to": 10, "q": 0.25}, {"from": 166, "to": 14, "q": 0.15},
-                     {"from": 166, "to": 27, "q": 0.15}, {"from": 166, "to": 39, "q": 0.16},
-                     {"from": 166, "to": 8, "q": 0.14}]
-}
-
-# 2. 构建图 (与之前相同)
-G = nx.Graph()
-
-# 添加卫星节点
-sat_nodes_list = []
-for sat in data['sat_attrs']:
-    node_id = f"s{sat['id']}"
-    G.add_node(node_id, type='satellite', health=sat['health'], pos=np.array(sat['pos']))
-    sat_nodes_list.append(node_id)
-
-# 添加目标节点
-for edge in data['target_edges']:
-    G.add_node(f"t{edge['to']}", type='target')
-
-# 添加卫星-卫星边
-for edge in data['sat_edges']:
-    if f"s{edge['from']}" in G and f"s{edge['to']}" in G:
-        G.add_edge(f"s{edge['from']}", f"s{edge['to']}", weight=1.0 / (edge['w'] + 1e-6), type='sat_link')
-
-# 添加卫星-目标边
-for edge in data['target_edges']:
-    if f"s{edge['from']}" in G and f"t{edge['to']}" in G:
-        G.add_edge(f"s{edge['from']}", f"t{edge['to']}", weight=1.0 / (edge['q'] + 1e-6), type='target_link')
-
-# 删除簇相关内容，直接进行交互式可视化
+    from graph_kernels import edge_line_xy
+
+# 交互式可视化库 plotly/dash 较重，只在绘图和创建应用时才导入，
+# 导入本模块（测试、工具脚本）不再承担建图与 plotly 的导入开销
+
+# 1. 数据准备：原始数据存放在同目录的 JSON 文件中，运行时一次性读入，替换数据无需改动源码
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'satellite_network_data.json')
+
+
+def load_data(path=DATA_PATH):
+    """读取卫星网络原始数据，优先使用 orjson 解析
+    Args:
+        path (str): JSON 数据文件路径
+    Returns:
+        dict: 包含 sat_attrs、sat_edges、target_edges 的原始数据
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        import orjson
+        return orjson.loads(raw)
+    except ImportError:
+        return json.loads(raw)
+
+
+# 2. 构建图
+def build_graph(data):
+    """由原始数据构建卫星-目标网络图
+    Args:
+        data (dict): 包含 sat_attrs、sat_edges、target_edges 的原始数据
+    Returns:
+        nx.Graph: 网络图；卫星3D坐标矩阵与卫星节点顺序存放在 G.graph['pos_matrix']、G.graph['sat_nodes'] 中，
+            各类节点与边的数量存放在 G.graph['counts'] 中
+    """
+    G = nx.Graph()
+
+    # 添加卫星节点：属性按列整理后批量加入，避免逐个 add_node
+    sat_df = pd.DataFrame(data['sat_attrs'])
+    # 原始id到节点名的映射只格式化一次，边的端点直接查表，不再为每条边重复拼接字符串
+    sid = {sat_id: f"s{sat_id}" for sat_id in sat_df['id'].tolist()}
+    sat_nodes_list = list(sid.values())
+    # 卫星3D坐标统一存放在一个连续矩阵中（SoA），节点上只记录所在行号
+    # 坐标仅用于降维和绘图，float32 精度足够，PCA 与序列化的数据量减半
+    pos_matrix = np.asarray(sat_df['pos'].tolist(), dtype=np.float32)
+    id_to_row = {node_id: i for i, node_id in enumerate(sat_nodes_list)}
+    G.add_nodes_from(
+        (node_id, {'type': 'satellite', 'health': health, 'row': row})
+        for (node_id, row), health in zip(id_to_row.items(), sat_df['health'].tolist())
+    )
+    G.graph['pos_matrix'] = pos_matrix
+    G.graph['sat_nodes'] = sat_nodes_list
+
+    # 添加目标节点
+    target_edge_df = pd.DataFrame(data['target_edges'])
+    tid = {tgt_id: f"t{tgt_id}" for tgt_id in target_edge_df['to'].unique().tolist()}
+    G.add_nodes_from(tid.values(), type='target')
+
+    # 边先按整数id对有效卫星集合过滤（sat_edges 中有不少引用了不存在的卫星，如125、136），
+    # 被丢弃的边不做任何查表；权重 1/(w+1e-6) 以 float32 整列 np.reciprocal 计算
+    sat_ids = sat_df['id'].to_numpy()
+
+    # 添加卫星-卫星边
+    sat_edge_df = pd.DataFrame(data['sat_edges'])
+    sat_edge_df = sat_edge_df[sat_edge_df['from'].isin(sat_ids) & sat_edge_df['to'].isin(sat_ids)]
+    # 无向图中正反向重复的边只保留一条：端点排序后去重，两个方向 w 不一致时明确取较大值
+    sat_ends = np.sort(sat_edge_df[['from', 'to']].to_numpy(), axis=1)
+    sat_edge_df = (pd.DataFrame({'from': sat_ends[:, 0], 'to': sat_ends[:, 1], 'w': sat_edge_df['w'].to_numpy()})
+                   .groupby(['from', 'to'], as_index=False, sort=False)['w'].max())
+    # 原始链路质量 w 以 float64 一并存到边上（quality），阈值过滤直接使用，不再由 float32 的权重反推
+    sat_quality = sat_edge_df['w'].to_numpy(dtype=np.float64)
+    sat_weights = np.reciprocal(sat_quality.astype(np.float32) + np.float32(1e-6))
+    G.add_edges_from(zip(sat_edge_df['from'].map(sid), sat_edge_df['to'].map(sid),
+                         ({'weight': w, 'quality': q, 'type': 'sat_link'}
+                          for w, q in zip(sat_weights.tolist(), sat_quality.tolist()))))
+    n_sat_links = G.number_of_edges()
+
+    # 添加卫星-目标边（目标节点由 target_edges 本身生成，只需检查卫星端）
+    target_edge_df = target_edge_df[target_edge_df['from'].isin(sat_ids)]
+    tgt_weights = np.reciprocal(target_edge_df['q'].to_numpy(dtype=np.float32) + np.float32(1e-6))
+    G.add_edges_from(zip(target_edge_df['from'].map(sid), target_edge_df['to'].map(tid),
+                         ({'weight': w, 'type': 'target_link'} for w in tgt_weights.tolist())))
+
+    # 节点与边的数量在建图时即可得到，记录下来供展示，不再事后遍历全图按类型计数
+    G.graph['counts'] = {
+        'satellite': len(sat_nodes_list),
+        'target': len(tid),
+        'sat_link': n_sat_links,
+        'target_link': G.number_of_edges() - n_sat_links,
+    }
+    return G
+
+
+def graph_adjacency(G):
+    """导出图的 CSR 稀疏邻接矩阵
+    最短路、连通分量等图分析直接在连续数组上用 scipy.sparse.csgraph 计算，不再遍历 NetworkX 的嵌套字典
+    Args:
+        G (nx.Graph): 网络图
+    Returns:
+        tuple[list, scipy.sparse.csr_array]: 行列对应的节点顺序，以及 float32 权重的 CSR 矩阵
+    """
+    graph_nodes = sorted(G.nodes)
+    A_csr = nx.to_scipy_sparse_array(G, nodelist=graph_nodes, weight='weight', format='csr', dtype=np.float32)
+    return graph_nodes, A_csr
+
 
 # 5. 交互式可视化准备
-# === 基于物理位置的布局 ===
-# 提取所有卫星的3D坐标
-sat_3d_pos = np.array([G.nodes[node]['pos'] for node in sat_nodes_list])
-
-# 使用PCA将3D坐标降至2D
-pca = PCA(n_components=2)
-sat_2d_pos_transformed = pca.fit_transform(sat_3d_pos)
-
-# 创建一个只包含卫星2D位置的初始布局字典
-pos_init = {node: sat_2d_pos_transformed[i] for i, node in enumerate(sat_nodes_list)}
-
-# 首先只布局卫星节点，大幅增大k值让卫星最大程度分散
-sat_subgraph = G.subgraph(sat_nodes_list)
-pos_sat_only = nx.spring_layout(sat_subgraph, pos=pos_init, k=400, iterations=2000, seed=42)
-
-# 为所有节点创建位置字典，先放入卫星位置
-pos = {}
-for sat_node in sat_nodes_list:
-    pos[sat_node] = pos_sat_only[sat_node]
-
-# 节点类型和属性
-node_types = nx.get_node_attributes(G, 'type')
-
-# 计算卫星网络的边界范围
-sat_positions = np.array([pos[sat] for sat in sat_nodes_list])
-sat_center = np.mean(sat_positions, axis=0)
-sat_radius = np.max([np.linalg.norm(pos[sat] - sat_center) for sat in sat_nodes_list])
-
-# 为每个目标节点手动分配位置，减少距离让它们更接近卫星
-target_nodes = [node for node in G.nodes() if node_types[node] == 'target']
-outer_radius = sat_radius + 1.2  # 在卫星网络外围1.2个单位
-
-# 将所有目标节点均匀分布在外围圆周上
-for i, target_node in enumerate(target_nodes):
-    angle = (i * 2 * np.pi) / len(target_nodes)
-    direction = np.array([np.cos(angle), np.sin(angle)])
-    pos[target_node] = sat_center + direction * outer_radius
-
-# 为每个节点分配唯一颜色（用于其出边）- 降低饱和度的版本
-all_nodes = list(G.nodes())
-def reduce_saturation(hex_color, saturation_factor=0.6):
-    """降低颜色饱和度"""
-    # 处理不同的颜色格式
-    if hex_color.startswith('rgb'):
-        import re
-        rgb_values = re.findall(r'\d+', hex_color)
-        if len(rgb_values) >= 3:
-            rgb = (int(rgb_values[0])/255.0, int(rgb_values[1])/255.0, int(rgb_values[2])/255.0)
-        else:
-            rgb = (0.5, 0.5, 0.5)
-    elif hex_color.startswith('#'):
-        hex_color = hex_color.lstrip('#')
-        if len(hex_color) == 6:
-            rgb = tuple(int(hex_color[i:i+2], 16)/255.0 for i in (0, 2, 4))
-        else:
-            rgb = (0.5, 0.5, 0.5)
-    else:
-        try:
-            import matplotlib.colors as mcolors
-            hex_color = mcolors.to_hex(hex_color)
-            hex_color = hex_color.lstrip('#')
-            rgb = tuple(int(hex_color[i:i+2], 16)/255.0 for i in (0, 2, 4))
-        except:
-            rgb = (0.5, 0.5, 0.5)
-    import colorsys
-    h, s, v = colorsys.rgb_to_hsv(rgb[0], rgb[1], rgb[2])
-    s = s * saturation_factor
-    rgb_new = colorsys.hsv_to_rgb(h, s, v)
-    return '#{:02x}{:02x}{:02x}'.format(int(rgb_new[0]*255), int(rgb_new[1]*255), int(rgb_new[2]*255))
-
-if PLOTLY_AVAILABLE:
-    px_colors = px.colors.qualitative.Set1 + px.colors.qualitative.Set2 + px.colors.qualitative.Set3
-    node_edge_color_map = {}
-    for i, node in enumerate(all_nodes):
-        original_color = px_colors[i % len(px_colors)]
-        node_edge_color_map[node] = reduce_saturation(original_color, 0.5)
-else:
-    import matplotlib.colors as mcolors
-    node_colors_for_edges = plt.cm.get_cmap('tab20', len(all_nodes))
-    node_edge_color_map = {}
-    for i, node in enumerate(all_nodes):
-        original_color = mcolors.to_hex(node_colors_for_edges(i))
-        node_edge_color_map[node] = reduce_saturation(original_color, 0.5)
+# 卫星数达到该规模后稠密 O(n²) 斥力成为布局瓶颈，改用 Barnes-Hut 四叉树近似斥力的 ForceAtlas2（需安装 fa2）
+BARNES_HUT_MIN_NODES = 500
+
+
+def barnes_hut_layout(G, nodelist, pos_init, iterations=2000):
+    """用 fa2 的 ForceAtlas2（Barnes-Hut 近似斥力，每轮 O(n log n)）计算大规模卫星网络布局
+    Args:
+        G (nx.Graph): 待布局的图
+        nodelist (list): 节点顺序，与 pos_init 的行对应
+        pos_init (np.ndarray): (N, 2) 初始坐标
+        iterations (int): 迭代次数
+    Returns:
+        np.ndarray: (N, 2) 布局坐标，缩放到 [-1, 1]；未安装 fa2 时返回 None
+    """
+    try:
+        from fa2 import ForceAtlas2
+    except ImportError:
+        return None
+    forceatlas2 = ForceAtlas2(scalingRatio=400.0, barnesHutOptimize=True, barnesHutTheta=1.2, verbose=False)
+    pos = forceatlas2.forceatlas2_networkx_layout(G, pos=dict(zip(nodelist, map(tuple, pos_init.tolist()))),
+                                                  iterations=iterations)
+    return nx.rescale_layout(np.array([pos[node] for node in nodelist]), scale=1)
+
+
+def fr_lbfgs_layout(G, nodelist, pos_init, k, maxiter=200, gravity=0.01):
+    """用 L-BFGS 直接最小化 Fruchterman-Reingold 能量求布局，替代 spring_layout 数千步的逐步模拟
+    以 k 为长度单位（y = x / k）时能量为 E = Σ_边 w·d³/3 − Σ_点对 ln d，其负梯度正是 FR 的引力 w·d² 与斥力 1/d。
+    存在孤立卫星或多个连通分量时该能量没有下界（斥力可把各部分无限推远），spring_layout 靠降温步长限制位移，
+    直接最小化则没有这一限制，因此另加一项很弱的向心引力 gravity/2·Σ|y − ȳ|²，使能量有下界
+    Args:
+        G (nx.Graph): 待布局的图，使用边的 weight 属性
+        nodelist (list): 节点顺序，与 pos_init 的行对应
+        pos_init (np.ndarray): (N, 2) 初始坐标
+        k (float): 最优节点间距
+        maxiter (int): L-BFGS 最大迭代次数
+        gravity (float): 向心引力系数
+    Returns:
+        np.ndarray: (N, 2) 布局坐标，与 spring_layout 一样缩放到 [-1, 1]
+    """
+    from scipy.optimize import minimize
+
+    n = len(nodelist)
+    # 对称的 COO 邻接：每条无向边出现两次，引力能量相应乘 1/2，梯度则恰好按行累加到两个端点
+    A = nx.to_scipy_sparse_array(G, nodelist=nodelist, weight='weight', format='coo')
+    rows, cols, w = A.row, A.col, A.data.astype(np.float64)
+    upper = np.triu_indices(n, 1)
+
+    def energy_and_grad(flat):
+        y = flat.reshape(n, 2)
+        # 斥力：全部点对，距离下限与 NetworkX 一致取 0.01
+        diff = y[:, None, :] - y[None, :, :]
+        dist = np.maximum(np.sqrt(np.einsum('ijk,ijk->ij', diff, diff)), 0.01)
+        energy = -np.log(dist[upper]).sum()
+        grad = -(diff / (dist ** 2)[:, :, None]).sum(axis=1)
+        # 引力：只在边上计算
+        edge_diff = y[rows] - y[cols]
+        edge_dist = np.maximum(np.sqrt(np.einsum('ij,ij->i', edge_diff, edge_diff)), 0.01)
+        energy += 0.5 * (w * edge_dist ** 3).sum() / 3
+        np.add.at(grad, rows, (w * edge_dist)[:, None] * edge_diff)
+        # 向心引力
+        centered = y - y.mean(axis=0)
+        energy += 0.5 * gravity * np.einsum('ij,ij->', centered, centered)
+        grad += gravity * centered
+        return energy, grad.ravel()
+
+    result = minimize(energy_and_grad, (np.asarray(pos_init, dtype=np.float64) / k).ravel(),
+                      jac=True, method='L-BFGS-B', options={'maxiter': maxiter})
+    return nx.rescale_layout(result.x.reshape(n, 2) * k, scale=1)
+
+
+def compute_layout(G):
+    """基于卫星物理位置计算全部节点的2D布局
+    布局在服务端一次性算好并固定为连续的 float32 坐标数组，浏览器端只绘制预先定位的点，不做任何力导向模拟
+    Args:
+        G (nx.Graph): build_graph 构建的网络图
+    Returns:
+        tuple[list, np.ndarray]: 节点顺序（卫星在前、目标在后）与对应的 (N, 2) 坐标数组
+    """
+    sat_nodes_list = G.graph['sat_nodes']
+    # 所有卫星的3D坐标，行顺序与 sat_nodes_list 一致
+    sat_3d_pos = G.graph['pos_matrix']
+
+    # 使用PCA将3D坐标降至2D：只需对 3x3 协方差矩阵做一次 eigh，取最大的两个特征向量投影，
+    # 省去 sklearn PCA 的参数校验与 SVD 开销
+    centered = sat_3d_pos - sat_3d_pos.mean(axis=0)
+    _, eigvecs = np.linalg.eigh(centered.T @ centered)
+    coords_2d = centered @ eigvecs[:, :-3:-1]
+
+    # 首先只布局卫星节点，以PCA坐标为初值，大幅增大k值让卫星最大程度分散
+    sat_subgraph = G.subgraph(sat_nodes_list)
+    sat_positions = None
+    if len(sat_nodes_list) >= BARNES_HUT_MIN_NODES:
+        sat_positions = barnes_hut_layout(sat_subgraph, sat_nodes_list, coords_2d)
+    if sat_positions is None:
+        sat_positions = fr_lbfgs_layout(sat_subgraph, sat_nodes_list, coords_2d, k=400)
+
+    # 计算卫星网络的边界范围，半径用 einsum 一次求出
+    sat_center = np.mean(sat_positions, axis=0)
+    diffs = sat_positions - sat_center
+    sat_radius = np.sqrt(np.einsum('ij,ij->i', diffs, diffs)).max()
+
+    # 为每个目标节点手动分配位置，减少距离让它们更接近卫星
+    target_nodes = [node for node, node_type in G.nodes(data='type') if node_type == 'target']
+    outer_radius = sat_radius + 1.2  # 在卫星网络外围1.2个单位
+
+    # 将所有目标节点均匀分布在外围圆周上：全部角度一次性计算，坐标直接写入预分配的结果数组，不再拼接
+    n_sat = len(sat_nodes_list)
+    layout_nodes = sat_nodes_list + target_nodes
+    layout_xy = np.empty((len(layout_nodes), 2), dtype=np.float32)
+    layout_xy[:n_sat] = sat_positions
+    if target_nodes:
+        angles = np.linspace(0, 2 * np.pi, len(target_nodes), endpoint=False)
+        layout_xy[n_sat:, 0] = sat_center[0] + outer_radius * np.cos(angles)
+        layout_xy[n_sat:, 1] = sat_center[1] + outer_radius * np.sin(angles)
+    return layout_nodes, layout_xy
+
 
 # 6. 创建可视化图表
-# 准备边数据
-sat_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'sat_link']
-target_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'target_link']
+def incident_edges(src_rows, dst_rows, n_rows):
+    """预先计算每个节点关联的边下标，高亮时只取该节点的边，代价与节点度数成正比
+    Args:
+        src_rows (np.ndarray): 边起点行号
+        dst_rows (np.ndarray): 边终点行号
+        n_rows (int): 节点总数
+    Returns:
+        list[np.ndarray]: 按节点行号索引的关联边下标数组
+    """
+    rows = np.concatenate([src_rows, dst_rows])
+    edge_ids = np.tile(np.arange(len(src_rows), dtype=np.int32), 2)
+    order = np.argsort(rows, kind='stable')
+    bounds = np.searchsorted(rows[order], np.arange(n_rows + 1))
+    return [edge_ids[order[bounds[i]:bounds[i + 1]]] for i in range(n_rows)]
 
-# Dash 应用
-app = dash.Dash(__name__)
 
-def make_figure(highlight_node=None):
-    """生成图表，若指定节点则高亮相关连线
+def node_colors(base_colors, highlight_colors, highlight_row):
+    """生成全部节点的颜色数组，被点击的节点换成其高亮色
     Args:
-        highlight_node (str): 被高亮的节点id（如's111'或't11'），为None时无高亮
+        base_colors (np.ndarray): 各节点的默认颜色
+        highlight_colors (np.ndarray): 各节点的高亮颜色
+        highlight_row (int): 高亮节点行号，为None时无高亮
     Returns:
-        go.Figure: plotly图对象
+        np.ndarray: 与 layout_xy 行对应的颜色数组
     """
-    fig = go.Figure()
-    # --- 画卫星间边 ---
-    for edge in sat_edges:
-        source, target, attr = edge
-        color = '#e74c3c' if highlight_node and (source == highlight_node or target == highlight_node) else '#cccccc'
-        width = 4 if highlight_node and (source == highlight_node or target == highlight_node) else 2
-        fig.add_trace(go.Scatter(
-            x=[pos[source][0], pos[target][0]],
-            y=[pos[source][1], pos[target][1]],
-            mode='lines',
-            line=dict(width=width, color=color),
-            hoverinfo='none',
-            showlegend=False,
-            name='卫星间连接'
+    colors = base_colors.copy()
+    if highlight_row is not None:
+        colors[highlight_row] = highlight_colors[highlight_row]
+    return colors
+
+
+def create_app(G):
+    """创建卫星网络交互式 Dash 应用
+    Args:
+        G (nx.Graph): build_graph 构建的网络图
+    Returns:
+        dash.Dash: 配置好布局与回调的应用
+    """
+    import dash
+    from dash import dcc, html, Input, Output, State, Patch
+
+    layout_nodes, layout_xy = compute_layout(G)
+    layout_row = {node: i for i, node in enumerate(layout_nodes)}
+    sat_nodes_list = G.graph['sat_nodes']
+
+    # 准备边数据
+    sat_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'sat_link']
+    target_edges = [edge for edge in G.edges(data=True) if edge[2]['type'] == 'target_link']
+    # 卫星间边按链路质量 w 降序排列，按阈值过滤时只需取前 k 条
+    # 质量只取一次，用稳定的 argsort 对 -w 排序（与 list.sort 同序），不再为每条边调用 Python 层的 key 函数
+    sat_quality = np.fromiter((attr['quality'] for _, _, attr in sat_edges), dtype=np.float64, count=len(sat_edges))
+    sat_order = np.argsort(-sat_quality, kind='stable')
+    sat_edges = [sat_edges[i] for i in sat_order.tolist()]
+    sat_quality = sat_quality[sat_order]
+
+    # 边端点在 layout_xy 中的行号，一次性收集为 int32 数组，绘图时按行号批量取坐标
+    sat_src_rows = np.fromiter((layout_row[u] for u, v, _ in sat_edges), dtype=np.int32, count=len(sat_edges))
+    sat_dst_rows = np.fromiter((layout_row[v] for u, v, _ in sat_edges), dtype=np.int32, count=len(sat_edges))
+    target_src_rows = np.fromiter((layout_row[u] for u, v, _ in target_edges), dtype=np.int32, count=len(target_edges))
+    target_dst_rows = np.fromiter((layout_row[v] for u, v, _ in target_edges), dtype=np.int32, count=len(target_edges))
+
+    # 节点类型掩码与逐点样式数组一次算好，全部节点按 layout_xy 行顺序合并为一条 trace 绘制，
+    # 之后只需替换颜色数组，不再逐节点判断类型
+    node_is_sat = np.zeros(len(layout_nodes), dtype=bool)
+    node_is_sat[[layout_row[node] for node in sat_nodes_list]] = True
+    base_colors = np.where(node_is_sat, 'green', '#D3D3D3')
+    highlight_colors = np.where(node_is_sat, '#f39c12', '#8e44ad')
+    node_marker = dict(
+        size=np.where(node_is_sat, 20, 16),
+        symbol=np.where(node_is_sat, 'circle', 'square'),
+        line=dict(width=np.where(node_is_sat, 3, 2), color=np.where(node_is_sat, 'white', '#696969'))
+    )
+    node_text = [node.replace('s1', '') if is_sat else node.replace('t', 'T')
+                 for node, is_sat in zip(layout_nodes, node_is_sat.tolist())]
+
+    # make_figure 中各 trace 的固定顺序，回调按下标用 Patch 局部更新
+    SAT_EDGE_TRACES = (0, 1)
+    TARGET_EDGE_TRACES = (2, 3)
+    NODE_TRACE = 4
+
+    # 普通边 trace 始终包含全部（阈值内的）边，高亮边 trace 叠加在其上，只含被点击节点的关联边
+    sat_incident = incident_edges(sat_src_rows, sat_dst_rows, len(layout_nodes))
+    target_incident = incident_edges(target_src_rows, target_dst_rows, len(layout_nodes))
+    no_edges = np.empty(0, dtype=np.int32)
+    # 普通边的折线坐标在启动时一次生成，之后不再变化；按阈值裁剪时直接取前 3*k 个点（每条边占 3 个点）
+    sat_edge_xs, sat_edge_ys = edge_line_xy(layout_xy, sat_src_rows, sat_dst_rows)
+    target_edge_xy = edge_line_xy(layout_xy, target_src_rows, target_dst_rows)
+
+    def edge_xy(highlight_row, k=None):
+        """按 trace 顺序生成边 trace 的坐标：(下标, (x, y))，k 为保留的卫星间边数，None 时全部保留"""
+        k = len(sat_src_rows) if k is None else k
+        sat_hl = no_edges if highlight_row is None else sat_incident[highlight_row]
+        sat_hl = sat_hl[sat_hl < k]
+        target_hl = no_edges if highlight_row is None else target_incident[highlight_row]
+        yield SAT_EDGE_TRACES[0], (sat_edge_xs[:3 * k], sat_edge_ys[:3 * k])
+        yield TARGET_EDGE_TRACES[0], target_edge_xy
+        yield SAT_EDGE_TRACES[1], edge_line_xy(layout_xy, sat_src_rows[sat_hl], sat_dst_rows[sat_hl])
+        yield TARGET_EDGE_TRACES[1], edge_line_xy(layout_xy, target_src_rows[target_hl], target_dst_rows[target_hl])
+
+    def visible_sat_edges(threshold):
+        """满足 w >= threshold 的卫星间边数；sat_quality 为降序，这些边恰好是前 k 条"""
+        return int(np.searchsorted(-sat_quality, -(threshold or 0), side='right'))
+
+    def make_figure(highlight_node=None, with_edges=True):
+        """生成图表，若指定节点则高亮相关连线
+        Args:
+            highlight_node (str): 被高亮的节点id（如's111'或't11'），为None时无高亮
+            with_edges (bool): 为False时边 trace 只占位不含数据，由回调随后补上
+        Returns:
+            go.Figure: plotly图对象
+        """
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+        highlight_row = layout_row.get(highlight_node) if highlight_node else None
+        colors = node_colors(base_colors, highlight_colors, highlight_row)
+        empty = np.empty(0, dtype=np.float32)
+        edges = dict(edge_xy(highlight_row)) if with_edges else dict.fromkeys(SAT_EDGE_TRACES + TARGET_EDGE_TRACES, (empty, empty))
+        # --- 画卫星间边 ---
+        (xs, ys), (hl_xs, hl_ys) = edges[SAT_EDGE_TRACES[0]], edges[SAT_EDGE_TRACES[1]]
+        fig.add_trace(go.Scattergl(
+            x=xs, y=ys, mode='lines', line=dict(width=2, color='#cccccc'),
+            hoverinfo='none', showlegend=False, name='卫星间连接'
         ))
-    # --- 画卫星-目标边 ---
-    for edge in target_edges:
-        source, target, attr = edge
-        color = '#2980b9' if highlight_node and (source == highlight_node or target == highlight_node) else '#bbbbbb'
-        width = 3 if highlight_node and (source == highlight_node or target == highlight_node) else 1.5
-        fig.add_trace(go.Scatter(
-            x=[pos[source][0], pos[target][0]],
-            y=[pos[source][1], pos[target][1]],
-            mode='lines',
-            line=dict(width=width, color=color, dash='dash'),
-            hoverinfo='none',
-            showlegend=False,
-            name='卫星-目标连接'
+        fig.add_trace(go.Scattergl(
+            x=hl_xs, y=hl_ys, mode='lines', line=dict(width=4, color='#e74c3c'),
+            hoverinfo='none', showlegend=False, name='卫星间连接'
         ))
-    # --- 画卫星节点 ---
-    for node in sat_nodes_list:
-        x, y = pos[node]
-        color = '#f39c12' if highlight_node == node else 'green'
-        fig.add_trace(go.Scatter(
-            x=[x], y=[y],
-            mode='markers+text',
-            marker=dict(size=20, color=color, line=dict(width=3, color='white')),
-            text=[node.replace('s1', '')],
-            textposition="middle center",
-            hoverinfo='text',
-            name='卫星节点',
-            customdata=[node],
-            showlegend=False
+        # --- 画卫星-目标边 ---
+        (xs, ys), (hl_xs, hl_ys) = edges[TARGET_EDGE_TRACES[0]], edges[TARGET_EDGE_TRACES[1]]
+        fig.add_trace(go.Scattergl(
+            x=xs, y=ys, mode='lines', line=dict(width=1.5, color='#bbbbbb', dash='dash'),
+            hoverinfo='none', showlegend=False, name='卫星-目标连接'
         ))
-    # --- 画目标节点 ---
-    for node in target_nodes:
-        x, y = pos[node]
-        color = '#8e44ad' if highlight_node == node else '#D3D3D3'
-        fig.add_trace(go.Scatter(
-            x=[x], y=[y],
+        fig.add_trace(go.Scattergl(
+            x=hl_xs, y=hl_ys, mode='lines', line=dict(width=3, color='#2980b9', dash='dash'),
+            hoverinfo='none', showlegend=False, name='卫星-目标连接'
+        ))
+        # --- 画卫星与目标节点 ---
+        fig.add_trace(go.Scattergl(
+            x=layout_xy[:, 0], y=layout_xy[:, 1],
             mode='markers+text',
-            marker=dict(size=16, color=color, symbol='square', line=dict(width=2, color='#696969')),
-            text=[node.replace('t', 'T')],
+            marker=dict(node_marker, color=colors),
+            text=node_text,
             textposition="middle center",
             hoverinfo='text',
-            name='目标节点',
-            customdata=[node],
+            name='网络节点',
+            customdata=layout_nodes,
             showlegend=False
         ))
-    fig.update_layout(
-        title='卫星网络连接关系与目标可见性（点击节点高亮）',
-        xaxis=dict(visible=False), yaxis=dict(visible=False),
-        plot_bgcolor='white', paper_bgcolor='white',
-        margin=dict(b=80, l=60, r=60, t=100),
-        dragmode='pan'
+        fig.update_layout(
+            title='卫星网络连接关系与目标可见性（点击节点高亮）',
+            xaxis=dict(visible=False), yaxis=dict(visible=False),
+            plot_bgcolor='white', paper_bgcolor='white',
+            margin=dict(b=80, l=60, r=60, t=100),
+            dragmode='pan',
+            # 回调更新数据时保留用户当前的缩放/平移视图
+            uirevision='constant'
+        )
+        return fig
+
+    # Dash 应用
+    # 图表序列化交给 orjson（C 实现，numpy 数组不经 Python 列表中转），未安装时沿用 plotly 默认引擎；
+    # 装有 flask-compress 时再对响应做 gzip 压缩
+    try:
+        import orjson  # noqa: F401
+        import plotly.io as pio
+        pio.json.config.default_engine = 'orjson'
+    except ImportError:
+        pass
+    try:
+        import flask_compress  # noqa: F401
+        compress = True
+    except ImportError:
+        compress = False
+    app = dash.Dash(__name__, compress=compress)
+
+    # 节点行号、边端点行号与每个节点的关联边下标，供客户端回调直接查表拼出高亮折线
+    edge_lookup = {
+        'x': layout_xy[:, 0].tolist(), 'y': layout_xy[:, 1].tolist(),
+        'row': layout_row,
+        'sat_src': sat_src_rows.tolist(), 'sat_dst': sat_dst_rows.tolist(),
+        'target_src': target_src_rows.tolist(), 'target_dst': target_dst_rows.tolist(),
+        'sat_quality': sat_quality.tolist(),
+        'sat_incident': [ids.tolist() for ids in sat_incident],
+        'target_incident': [ids.tolist() for ids in target_incident],
+        'base_colors': base_colors.tolist(), 'highlight_colors': highlight_colors.tolist(),
+        'traces': {'sat_base': SAT_EDGE_TRACES[0], 'sat_hl': SAT_EDGE_TRACES[1],
+                   'target_hl': TARGET_EDGE_TRACES[1], 'node': NODE_TRACE},
+    }
+
+    app.layout = html.Div([
+        html.H2("卫星网络交互式图表（点击节点高亮相关连线）"),
+        # 高亮所需的查找表启动时一次下发，之后点击与阈值调整都在浏览器内完成，不再回到 Python
+        dcc.Store(id='edge-lookup', data=edge_lookup),
+        dcc.Store(id='hilite'),
+        # 首屏只发送节点，边数据在页面渲染后由 edge-loader 触发一次回调以 Patch 补上
+        dcc.Interval(id='edge-loader', interval=50, n_intervals=0, max_intervals=1),
+        dcc.Graph(
+            id='network-graph',
+            figure=make_figure(with_edges=False),
+            config={'displayModeBar': True, 'scrollZoom': True},
+            style={'height': '95vh', 'width': '100%'}
+        ),
+        html.Div("点击任意卫星或目标节点，高亮其相关连线。再次点击空白处恢复。", style={'color': 'gray'}),
+        html.Div("卫星间链路质量阈值（低于阈值的链路不绘制）：", style={'color': 'gray'}),
+        dcc.Slider(id='edge-threshold', min=0, max=float(np.ceil(sat_quality.max(initial=0) * 100) / 100),
+                   step=0.01, value=0, marks=None, tooltip={'placement': 'bottom'})
+    ])
+
+    @app.callback(
+        Output('network-graph', 'figure', allow_duplicate=True),
+        Input('edge-loader', 'n_intervals'),
+        State('edge-threshold', 'value'),
+        prevent_initial_call=True
     )
-    return fig
-
-app.layout = html.Div([
-    html.H2("卫星网络交互式图表（点击节点高亮相关连线）"),
-    dcc.Graph(
-        id='network-graph',
-        figure=make_figure(),
-        config={'displayModeBar': True, 'scrollZoom': True},
-        style={'height': '95vh', 'width': '100%'}
-    ),
-    html.Div("点击任意卫星或目标节点，高亮其相关连线。再次点击空白处恢复。", style={'color': 'gray'})
-])
-
-@app.callback(
-    Output('network-graph', 'figure'),
-    Input('network-graph', 'clickData')
-)
-def update_highlight(clickData):
-    """Dash回调：根据点击事件高亮相关连线
-    Args:
-        clickData (dict): dash点击事件数据
-    Returns:
-        go.Figure: 更新后的图
-    """
-    if clickData and clickData['points']:
-        node = clickData['points'][0]['customdata']
-        return make_figure(highlight_node=node)
-    return make_figure()
+    def load_edges(n_intervals, threshold):
+        """Dash回调：首屏渲染后补发边数据，节点部分不重复序列化
+        Args:
+            n_intervals (int): edge-loader 触发次数
+            threshold (float): 卫星间链路质量阈值
+        Returns:
+            Patch: 只包含边坐标的局部更新
+        """
+        patched = Patch()
+        # 普通边坐标已预先算好，这里只是按阈值切片，无需缓存
+        for trace_id, (xs, ys) in edge_xy(None, visible_sat_edges(threshold)):
+            patched['data'][trace_id]['x'] = xs
+            patched['data'][trace_id]['y'] = ys
+        return patched
+
+    # 点击高亮与阈值裁剪由浏览器内的 Plotly.restyle 完成：只改写高亮边、普通卫星间边与节点颜色，
+    # 不经过网络往返与服务端序列化；hilite 记录当前被点击的节点id
+    app.clientside_callback(
+        """
+        function(clickData, threshold, g) {
+            var gd = document.querySelector('#network-graph .js-plotly-plot');
+            if (!gd || !g) { return window.dash_clientside.no_update; }
+            var node = (clickData && clickData.points && clickData.points.length) ? clickData.points[0].customdata : null;
+            var row = (node != null && g.row.hasOwnProperty(node)) ? g.row[node] : -1;
+            // sat_quality 为降序，满足 w >= threshold 的卫星间边恰好是前 k 条
+            var t = threshold || 0, k = 0;
+            while (k < g.sat_quality.length && g.sat_quality[k] >= t) { k++; }
+            function lines(src, dst, ids) {
+                var xs = [], ys = [];
+                for (var j = 0; j < ids.length; j++) {
+                    var i = ids[j];
+                    xs.push(g.x[src[i]], g.x[dst[i]], null);
+                    ys.push(g.y[src[i]], g.y[dst[i]], null);
+                }
+                return [xs, ys];
+            }
+            var baseIds = [];
+            for (var i = 0; i < k; i++) { baseIds.push(i); }
+            var base = lines(g.sat_src, g.sat_dst, baseIds);
+            var satHl = row < 0 ? [] : g.sat_incident[row].filter(function (i) { return i < k; });
+            var sat = lines(g.sat_src, g.sat_dst, satHl);
+            var target = lines(g.target_src, g.target_dst, row < 0 ? [] : g.target_incident[row]);
+            var colors = g.base_colors.slice();
+            if (row >= 0) { colors[row] = g.highlight_colors[row]; }
+            window.Plotly.restyle(gd, {x: [base[0], sat[0], target[0]], y: [base[1], sat[1], target[1]]},
+                                  [g.traces.sat_base, g.traces.sat_hl, g.traces.target_hl]);
+            window.Plotly.restyle(gd, {'marker.color': [colors]}, [g.traces.node]);
+            return row < 0 ? null : node;
+        }
+        """,
+        Output('hilite', 'data'),
+        Input('network-graph', 'clickData'),
+        Input('edge-threshold', 'value'),
+        State('edge-lookup', 'data'),
+        prevent_initial_call=True
+    )
+
+    return app
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    data = load_data()
+    G = build_graph(data)
+    app = create_app(G)
+    # 连通分量只在这里统计一次，scipy.sparse.csgraph 随之按需导入
+    from scipy.sparse.csgraph import connected_components
+    _, A_csr = graph_adjacency(G)
+    n_components, _ = connected_components(A_csr, directed=False)
 
-# 显示网络信息
-print("卫星网络可视化完成")
-print(f"卫星节点数: {len([n for n in G.nodes() if node_types[n] == 'satellite'])}")
-print(f"目标节点数: {len([n for n in G.nodes() if node_types[n] == 'target'])}")
-print(f"卫星间连接数: {len(sat_edges)}")
-print(f"卫星-目标连接数: {len(target_edges)}")
+    # 显示网络信息
+    counts = G.graph['counts']
+    print("卫星网络可视化完成")
+    print(f"卫星节点数: {counts['satellite']}")
+    print(f"目标节点数: {counts['target']}")
+    print(f"卫星间连接数: {counts['sat_link']}")
+    print(f"卫星-目标连接数: {counts['target_link']}")
+    print(f"连通分量数: {n_components}")
 
+    # 调试模式会启用 Flask 调试器与自动重载，只在显式设置 DASH_DEBUG=1 时开启
+    app.run(debug=os.environ.get('DASH_DEBUG') == '1')
@@ -0,0 +1,57 @@
+"""卫星网络可视化中每次交互都会重复执行的数值计算
+
+安装了 numba 时以 @njit(cache=True) 编译为机器码（cache=True 使重启应用时无需重新编译），
+未安装时退化为等价的 NumPy 向量化实现。
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def edge_line_xy(layout_xy, src_rows, dst_rows):
+        """把多条边拼接为一组以 NaN 分隔的折线坐标，用单条 trace 绘制全部线段
+        Args:
+            layout_xy (np.ndarray): 节点2D坐标数组
+            src_rows (np.ndarray): 边起点在 layout_xy 中的行号
+            dst_rows (np.ndarray): 边终点在 layout_xy 中的行号
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 长度为 3*E 的 x、y 坐标数组
+        """
+        n_edges = src_rows.shape[0]
+        xs = np.empty(3 * n_edges, dtype=np.float32)
+        ys = np.empty(3 * n_edges, dtype=np.float32)
+        for i in range(n_edges):
+            src = src_rows[i]
+            dst = dst_rows[i]
+            xs[3 * i] = layout_xy[src, 0]
+            xs[3 * i + 1] = layout_xy[dst, 0]
+            xs[3 * i + 2] = np.nan
+            ys[3 * i] = layout_xy[src, 1]
+            ys[3 * i + 1] = layout_xy[dst, 1]
+            ys[3 * i + 2] = np.nan
+        return xs, ys
+else:
+    def edge_line_xy(layout_xy, src_rows, dst_rows):
+        """把多条边拼接为一组以 NaN 分隔的折线坐标，用单条 trace 绘制全部线段
+        Args:
+            layout_xy (np.ndarray): 节点2D坐标数组
+            src_rows (np.ndarray): 边起点在 layout_xy 中的行号
+            dst_rows (np.ndarray): 边终点在 layout_xy 中的行号
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 长度为 3*E 的 x、y 坐标数组
+        """
+        xs = np.empty(3 * len(src_rows), dtype=np.float32)
+        ys = np.empty(3 * len(src_rows), dtype=np.float32)
+        xs[0::3] = layout_xy[src_rows, 0]
+        xs[1::3] = layout_xy[dst_rows, 0]
+        xs[2::3] = np.nan
+        ys[0::3] = layout_xy[src_rows, 1]
+        ys[1::3] = layout_xy[dst_rows, 1]
+        ys[2::3] = np.nan
+        return xs, ys
@@ -9,22 +9,91 @@
 import sqlite3
 import json
 import datetime
+import threading
 from typing import List, Tuple, Optional
 from icecream import ic
 import Tools
 
+# 行内 JSON 列的解码优先使用 orjson，未安装时退回标准库
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 class DatabaseManager:
+    # 目标记录的基本字段，顺序与各查询返回的字典一致
+    RECORD_COLUMNS = ("name", "description", "longitude", "latitude", "priority", "access_period", "access", "value",
+                      "last_access_date", "freeze_timestamp", "target_status", "update_at")
+    _RECORD_SELECT = ", ".join(RECORD_COLUMNS)
+    # 带观测轨道的完整目标字段，只查询实际用到的列，按列名取值，不依赖表结构中的列顺序
+    TARGET_COLUMNS = RECORD_COLUMNS + ("access_orbit",)
+    _TARGET_SELECT = ", ".join(TARGET_COLUMNS)
+    # 数据库结构版本，记录在 PRAGMA user_version 中：
+    # 1 - access 列已改写为单层 JSON 对象数组；2 - target_orbit 已补齐并由触发器同步
+    SCHEMA_VERSION = 2
+
     def __init__(self, db_name: str):
         self.db_name = db_name
+        # 每个线程各自复用一个连接，避免每次调用都重新打开数据库、解析表结构，
+        # 不同线程的事务与未读完的游标也不会相互交错；
+        # 各方法中的 with self._conn 块在退出时自动提交（异常时回滚）
+        self._local = threading.local()
+        # 所有线程打开的连接，close 时统一关闭
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self._create_table()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        当前线程的数据库连接，首次使用时打开
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 查询一律使用参数绑定，SQL 文本固定，预编译语句缓存可以反复命中；
+            # 连接只在所属线程中使用，check_same_thread=False 仅为了让 close 能从任意线程关闭它
+            conn = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            # 查询结果按列名访问，由 C 层直接构造，省去逐列手写下标
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """
+        关闭所有线程打开的数据库连接，调用前各线程应已结束对本实例的使用
+        """
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    @staticmethod
+    def _decode_target(row: sqlite3.Row) -> dict:
+        """
+        把 target_list 的一行转为字典，并解码 access、access_orbit 两个 JSON 列
+        :param row: 查询结果行
+        :return:
+        """
+        target = dict(row)
+        target["access"] = json_loads(row["access"])
+        target["access_orbit"] = json_loads(row["access_orbit"])
+        return target
+
     def _create_table(self):
         """
         创建数据表
         Returns:
 
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS target_list(
@@ -43,7 +112,83 @@ class DatabaseManager:
                     update_at TEXT
                 )
             """)
-            conn.commit()
+            # 目标-轨道关系表：access_orbit 中的轨道编号由触发器同步写入此表，按轨道查目标时走索引，无需逐行解析 JSON
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS target_orbit(
+                    target_id INTEGER NOT NULL,
+                    orbit_cnt INTEGER NOT NULL,
+                    PRIMARY KEY (orbit_cnt, target_id)
+                ) WITHOUT ROWID
+            """)
+            # 触发器与补齐按 target_id 查找、删除关系行
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_target_orbit_target ON target_orbit(target_id)")
+            # 一次性的数据迁移按 user_version 只执行一次，此后启动时不再整表扫描
+            user_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if user_version < 1:
+                self._migrate_access_json(cursor)
+            if user_version < 2:
+                self._sync_target_orbit(cursor)
+            if user_version < self.SCHEMA_VERSION:
+                cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @staticmethod
+    def _migrate_access_json(cursor: sqlite3.Cursor):
+        """
+        旧数据的 access 列保存的是"JSON 字符串组成的 JSON 数组"，读取时每行要解析 1 + len(access) 次；
+        这里一次性在 SQLite 内部把它们改写为单层的对象数组，此后读取只需一次 json.loads
+        :param cursor:
+        :return:
+        """
+        cursor.execute("""
+            UPDATE target_list
+            SET access = (SELECT json_group_array(json(value)) FROM json_each(target_list.access))
+            WHERE json_valid(access) AND json_type(access, '$[0]') = 'text'
+        """)
+
+    # access_orbit 不是合法 JSON 时按空数组处理，不让触发器中的 json_each 报错
+    _ORBIT_JSON = "CASE WHEN json_valid({0}) THEN {0} ELSE '[]' END"
+
+    @classmethod
+    def _sync_target_orbit(cls, cursor: sqlite3.Cursor):
+        """
+        target_orbit 只是 access_orbit 的索引副本：
+        建立触发器，使 target_list 的任何插入、access_orbit 的任何修改（包括 update_record、原始 SQL）与删除
+        都同步重建该目标的 target_orbit 行；并为还没有 target_orbit 行的目标补齐已有的关系
+        :param cursor:
+        :return:
+        """
+        columns = [column[1] for column in cursor.execute("PRAGMA table_info(target_list)")]
+        if "access_orbit" not in columns:
+            return
+        new_orbit = cls._ORBIT_JSON.format("NEW.access_orbit")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS target_orbit_after_insert AFTER INSERT ON target_list
+            BEGIN
+                INSERT OR IGNORE INTO target_orbit(target_id, orbit_cnt)
+                SELECT NEW.id, value FROM json_each({new_orbit});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS target_orbit_after_update AFTER UPDATE OF access_orbit ON target_list
+            BEGIN
+                DELETE FROM target_orbit WHERE target_id = OLD.id;
+                INSERT OR IGNORE INTO target_orbit(target_id, orbit_cnt)
+                SELECT NEW.id, value FROM json_each({new_orbit});
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS target_orbit_after_delete AFTER DELETE ON target_list
+            BEGIN
+                DELETE FROM target_orbit WHERE target_id = OLD.id;
+            END
+        """)
+        # 触发器建立之前写入的数据逐行补齐，而不是只在整张表为空时导入
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO target_orbit(target_id, orbit_cnt)
+            SELECT t.id, j.value FROM target_list t, json_each({cls._ORBIT_JSON.format("t.access_orbit")}) AS j
+            WHERE t.access_orbit IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM target_orbit o WHERE o.target_id = t.id)
+        """)
 
     def add_record(self, target_list: List):
         """
@@ -55,7 +200,7 @@ class DatabaseManager:
                     latitude: 经度
                     priority: 预定义优先级
                     access_period: 预定义重访周期
-                    access: 观测分辨率
+                    access: 观测分辨率，JSON 对象数组字符串，即 json.dumps(dicts)
                     value: 计算价值
                     last_access_date: 上次访问日期
                     freeze_timestamp: 截止该时间戳前目标不可访问
@@ -63,14 +208,13 @@ class DatabaseManager:
                     update_at: 数据更新时间
         :return: None
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.executemany("""
                 INSERT OR IGNORE INTO target_list(name,description, longitude, latitude, priority,access_period,
                         access,value,last_access_date,freeze_timestamp, target_status, update_at) 
                         VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
             """, target_list)
-            conn.commit()
 
     def update_record(self, target_name: str, **update_values):
         """
@@ -79,17 +223,17 @@ class DatabaseManager:
         :param update_values: value=2.5, freeze_timestamp=1457933268, ...
         :return:
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             set_clause = ", ".join([f"{column} = ?" for column in update_values])
             set_clause = set_clause + ",update_at=?"
 
-            update_query = f"UPDATE target_list SET {set_clause} WHERE name='{target_name}'"
+            update_query = f"UPDATE target_list SET {set_clause} WHERE name=?"
             params = list(update_values.values())
             update_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             params.append(update_at)
-            result = cursor.execute(update_query, params)
-            conn.commit()
+            params.append(target_name)
+            cursor.execute(update_query, params)
 
     def excute_raw_sql(self, sql: str):
         """
@@ -97,8 +241,10 @@ class DatabaseManager:
         :param sql:
         :return:
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
+            # 原始 sql 的结果保持元组形式
+            cursor.row_factory = None
             cursor.execute(sql)
             return cursor.fetchall()
 
@@ -108,35 +254,14 @@ class DatabaseManager:
         :param limit: 限制条数
         :return:
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             current_time = Tools.current_timestamp()
-            query = (
-                f"SELECT name,description, longitude, latitude, priority,access_period, access,value,last_access_date,"
-                f"freeze_timestamp, target_status, update_at FROM target_list WHERE freeze_timestamp <= "
-                f"'{current_time}' AND target_status=0 ORDER BY value DESC LIMIT {limit}")
-            # print(query)
-            cursor.execute(query)
+            query = (f"SELECT {self._RECORD_SELECT} FROM target_list "
+                     f"WHERE freeze_timestamp <= ? AND target_status=0 ORDER BY value DESC LIMIT ?")
+            cursor.execute(query, (current_time, limit))
             combined_records = cursor.fetchall()
-            targets_list_dict = []
-            for record in combined_records:
-                targets_list_dict.append(
-                    {
-                        "name": record[0],
-                        "description": record[1],
-                        "longitude": record[2],
-                        "latitude": record[3],
-                        "priority": record[4],
-                        "access_period": record[5],
-                        "access": record[6],
-                        "value": record[7],
-                        "last_access_date": record[8],
-                        "freeze_timestamp": record[9],
-                        "target_status": record[10],
-                        "update_at": record[11]
-                    }
-                )
-            return targets_list_dict
+            return [dict(record) for record in combined_records]
 
     def get_top_records_by(self, order_type: str, asc: str, limit: int) -> List[dict]:
         """
@@ -147,36 +272,20 @@ class DatabaseManager:
             order_type:
             limit: 限制条数
         """
-        with sqlite3.connect(self.db_name) as conn:
+        # ORDER BY 的列名和方向无法参数化，按白名单校验后再拼入 SQL
+        if order_type not in self.RECORD_COLUMNS:
+            raise ValueError(f"不支持按 {order_type} 排序")
+        if asc.upper() not in ("ASC", "DESC"):
+            raise ValueError(f"排序方向只能是 ASC 或 DESC，而不是 {asc}")
+        with self._conn as conn:
             cursor = conn.cursor()
-            query = (
-                f"SELECT name,description, longitude, latitude, priority,access_period, access,value,last_access_date,"
-                f"freeze_timestamp, target_status, update_at FROM target_list ORDER BY {order_type} {asc} LIMIT {limit}")
-            # print(query)
-            cursor.execute(query)
+            query = f"SELECT {self._RECORD_SELECT} FROM target_list ORDER BY {order_type} {asc.upper()} LIMIT ?"
+            cursor.execute(query, (limit,))
             combined_records = cursor.fetchall()
-            targets_list_dict = []
-            for record in combined_records:
-                targets_list_dict.append(
-                    {
-                        "name": record[0],
-                        "description": record[1],
-                        "longitude": record[2],
-                        "latitude": record[3],
-                        "priority": record[4],
-                        "access_period": record[5],
-                        "access": record[6],
-                        "value": record[7],
-                        "last_access_date": record[8],
-                        "freeze_timestamp": record[9],
-                        "target_status": record[10],
-                        "update_at": record[11]
-                    }
-                )
-            return targets_list_dict
+            return [dict(record) for record in combined_records]
 
     def get_db_structure(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
 
             # 查询有哪些数据表
@@ -205,229 +314,137 @@ class DatabaseManager:
                 10 target_status,
                 11 update_at
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             # current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             current_time = Tools.current_timestamp()
-            query = (
-                f"SELECT name,description, longitude, latitude, priority,access_period, access,value,last_access_date,"
-                f"freeze_timestamp, target_status, update_at FROM target_list WHERE freeze_timestamp <= "
-                f"'{current_time}' ORDER BY value DESC LIMIT {limit}")
-            cursor.execute(query)
+            query = f"SELECT {self._RECORD_SELECT} FROM target_list WHERE freeze_timestamp <= ? ORDER BY value DESC LIMIT ?"
+            cursor.execute(query, (current_time, limit))
             top_records = cursor.fetchall()
             if not top_records:
                 return top_records
 
             # 获取最小value
-            min_value = top_records[-1][7]
+            min_value = top_records[-1]["value"]
             # 获取所有的包含该最小值的记录
-            query = (
-                f"SELECT name,description, longitude, latitude, priority,access_period, access,value,last_access_date,"
-                f"freeze_timestamp, target_status, update_at FROM target_list WHERE freeze_timestamp <= "
-                f"'{current_time}' AND value = {min_value} ORDER BY value DESC")
-            cursor.execute(query)
+            query = f"SELECT {self._RECORD_SELECT} FROM target_list WHERE freeze_timestamp <= ? AND value = ? ORDER BY value DESC"
+            cursor.execute(query, (current_time, min_value))
             min_value_records = cursor.fetchall()
 
             # combine the record
-            combined_records = [record for record in top_records if record[7] > min_value] + min_value_records
-            targets_list_dict = []
-            for record in combined_records:
-                targets_list_dict.append(
-                    {
-                        "name": record[0],
-                        "description": record[1],
-                        "longitude": record[2],
-                        "latitude": record[3],
-                        "priority": record[4],
-                        "access_period": record[5],
-                        "access": record[6],
-                        "value": record[7],
-                        "last_access_date": record[8],
-                        "freeze_timestamp": record[9],
-                        "target_status": record[10],
-                        "update_at": record[11]
-                    }
-                )
-            return targets_list_dict
+            combined_records = [record for record in top_records if record["value"] > min_value] + min_value_records
+            return [dict(record) for record in combined_records]
 
     def refresh_all_target(self):
         """
         更新目标的不可选时间
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             update_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cursor.execute(f"UPDATE target_list "
-                           f"SET freeze_timestamp=0, "
-                           f"target_status=0, "
-                           f"last_access_date='',"
-                           f"update_at='{update_at}'")
-            conn.commit()
+            cursor.execute("UPDATE target_list "
+                           "SET freeze_timestamp=0, "
+                           "target_status=0, "
+                           "last_access_date='',"
+                           "update_at=?", (update_at,))
 
     # ------------------------ 新增方法 -----------------------------
 
+    # 按优先级取前 2000 个目标后再按状态过滤，Load_targets_from_Datebase 与 get_targets_not_visit 共用
+    _TOP_TARGETS_QUERY = (f"SELECT {_TARGET_SELECT} FROM "
+                          f"(SELECT * FROM target_list ORDER BY priority DESC LIMIT 2000) AS top_targets "
+                          f"WHERE target_status {{}}")
+
+    def _iter_rows(self, query: str, params: tuple = (), batch: int = 500):
+        """
+        以 fetchmany 分批读取查询结果并逐个解码，任一时刻只有 batch 行驻留内存
+        :param query: 查询语句
+        :param params: 绑定参数
+        :param batch: 每批读取的行数
+        :return: 目标字典生成器
+        """
+        cursor = self._conn.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._decode_target(row)
+        finally:
+            cursor.close()
+
+    def iter_targets(self, batch: int = 500):
+        """
+        逐个产出未观测目标(target_status = 0)，调用方可直接迭代而不必先构造完整列表
+        :param batch: 每批读取的行数
+        :return: 目标字典生成器
+        """
+        return self._iter_rows(self._TOP_TARGETS_QUERY.format("= 0"), batch=batch)
+
     def Load_targets_from_Datebase(self):
         '''
             从数据库中获取未观测目标数据(target_status = 0)， 为加快代码测试效率随机选取2000个目标
         '''
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM (SELECT * FROM target_list ORDER BY priority DESC LIMIT 2000) AS top_targets "
-                            "WHERE target_status = 0")
-            records = cursor.fetchall()
-            if not records:
-                return records
-        
-        targets_list = []
-        for row in records:
-            # ic(row)
-            access_data = []
-            access_data_str = json.loads(row[7])
-            for dic_str in access_data_str:
-                dic = json.loads(dic_str)
-                access_data.append(dic)
-            
-            targets_list.append(
-                {
-                    "name": row[1],
-                    "description": row[2],
-                    "longitude": row[3],
-                    "latitude": row[4],
-                    "priority": row[5],
-                    "access_period": row[6],
-                    "access": access_data,
-                    "value": row[8],
-                    "last_access_date": row[9],
-                    "freeze_timestamp": row[10],
-                    "target_status": row[11],
-                    "update_at": row[12],
-                    "access_orbit": json.loads(row[13])
-                })
-        
-        return targets_list
+        return list(self.iter_targets())
             
     def update_target_status(self, str_list:list):
         '''
             已被观测的目标状态更新 target_status=1
         '''
         update_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        param = [update_at] + list(str_list)
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            query = 'UPDATE target_list SET target_status = 1, update_at = ? WHERE name IN (%s)' % ', '.join(['?'] * len(str_list))
-            cursor.execute(query, param)
-            conn.commit()
+        # 固定形状的语句配合 executemany，在同一事务内逐个目标更新，预编译语句每次都能复用
+        with self._conn as conn:
+            conn.executemany("UPDATE target_list SET target_status = 1, update_at = ? WHERE name = ?",
+                             [(update_at, name) for name in str_list])
 
     def get_targets_not_visit(self) -> list:
         '''
             返回当前剩余多少未观测的目标
         '''
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            query = ("SELECT * FROM (SELECT * FROM target_list ORDER BY priority DESC LIMIT 2000) AS top_targets "
-                     "WHERE target_status != 1")
-            cursor.execute(query)
-            results = cursor.fetchall()
-
-        targets_not_visit = []
-        for record in results:
-            access_data = []
-            access_data_str = json.loads(record[7])
-            for dic_str in access_data_str:
-                dic = json.loads(dic_str)
-                access_data.append(dic)
-
-            targets_not_visit.append(
-                {
-                    "name": record[1],
-                    "description": record[2],
-                    "longitude": record[3],
-                    "latitude": record[4],
-                    "priority": record[5],
-                    "access_period": record[6],
-                    "access": access_data,
-                    "value": record[8],
-                    "last_access_date": record[9],
-                    "freeze_timestamp": record[10],
-                    "target_status": record[11],
-                    "update_at": record[12],
-                    "access_orbit": json.loads(record[13])
-                }
-            )
-
-        return targets_not_visit
+        return list(self._iter_rows(self._TOP_TARGETS_QUERY.format("!= 1")))
         
     def update_orbit_cnt(self, target_name:list, orbit_cnt:int):
         '''
             更新当前已观测的轨道数
         '''
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
-            placeholders = ', '.join(['?'] * len(target_name))
-            # 初始化 access_orbit 字段
-            init_query = f"UPDATE target_list SET access_orbit = json('[]') WHERE name IN ({placeholders}) AND access_orbit IS NULL"
-            cursor.execute(init_query, target_name)
-
-            insert_query = f"UPDATE target_list SET access_orbit = json_insert(access_orbit, '$[#]', ?) WHERE name IN ({placeholders})"
-            params = [orbit_cnt] + target_name
-            cursor.execute(insert_query, params)
-            conn.commit()
+            params = [(orbit_cnt, name) for name in target_name]
+            # access_orbit 为空时先初始化为空数组再追加，target_orbit 由触发器在同一事务内同步
+            cursor.executemany("UPDATE target_list SET access_orbit = json_insert(COALESCE(access_orbit, json('[]')), '$[#]', ?) "
+                               "WHERE name = ?", params)
 
     def get_targets_with_orbit(self, orbit_cnt: int) -> List[dict]:
         '''
             获取包含指定轨道编号的所有目标
         '''
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
+            columns = ", ".join(f"t.{column}" for column in self.TARGET_COLUMNS)
             query = f"""
-                SELECT t.*
-                FROM target_list t
-                JOIN json_each(t.access_orbit) AS j
-                ON json_extract(j.value, '$') = ?
+                SELECT {columns}
+                FROM target_orbit o
+                JOIN target_list t ON t.id = o.target_id
+                WHERE o.orbit_cnt = ?
             """
             cursor.execute(query, (orbit_cnt,))
             results = cursor.fetchall()
 
-        targets_list_dict = []
-        for record in results:
-            access_data = []
-            access_data_str = json.loads(record[7])
-            for dic_str in access_data_str:
-                dic = json.loads(dic_str)
-                access_data.append(dic)
-            
-            targets_list_dict.append(
-                {
-                    "name": record[1],
-                    "description": record[2],
-                    "longitude": record[3],
-                    "latitude": record[4],
-                    "priority": record[5],
-                    "access_period": record[6],
-                    "access": access_data,
-                    "value": record[8],
-                    "last_access_date": record[9],
-                    "freeze_timestamp": record[10],
-                    "target_status": record[11],
-                    "update_at": record[12],
-                    "access_orbit": json.loads(record[13])
-                }
-            )
-        return targets_list_dict
+        return [self._decode_target(record) for record in results]
 
     def reset_orbit_cnt(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute(f"UPDATE target_list "
                            f"SET access = json('[]')")
                         #    f"SET access_orbit = json('[]')")
-            conn.commit()
 
     def add_column_to_db(self, column_name:str, column_type:str):
         '''
             添加新列
         '''
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             
             # 检查列是否存在
@@ -438,7 +455,8 @@ class DatabaseManager:
             if column_name not in existing_columns:
                 query = f"ALTER TABLE target_list ADD COLUMN {column_name} {column_type}"
                 cursor.execute(query)
-                conn.commit()
+                if column_name == "access_orbit":
+                    self._sync_target_orbit(cursor)
             else:
                 print(f"列 {column_name} 已经存在，不进行添加")
 
@@ -450,40 +468,74 @@ class DatabaseManager:
         :param column_name: 要修改的列名
         :param new_column_type: 新的数据类型
         """
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-
-            # 创建临时表
-            cursor.execute("PRAGMA table_info(target_list)")
-            columns = cursor.fetchall()
-            temp_table_name = "target_list_temp"
-            create_temp_table_sql = f"CREATE TABLE {temp_table_name} ("
-
-            for column in columns:
-                if column[1] == column_name:
-                    create_temp_table_sql += f"{column_name} {new_column_type}, "
-                else:
-                    create_temp_table_sql += f"{column[1]} {column[2]}, "
-
-            # 去掉最后一个逗号
-            create_temp_table_sql = create_temp_table_sql.rstrip(", ") + ")"
-            cursor.execute(create_temp_table_sql)
-
-            # 将数据从原表复制到临时表
-            columns_names = [column[1] for column in columns]
-            columns_str = ", ".join(columns_names)
-            cursor.execute(f"INSERT INTO {temp_table_name} ({columns_str}) SELECT {columns_str} FROM target_list")
-
-            # 删除原表
-            cursor.execute(f"DROP TABLE target_list")
-
-            # 将临时表重命名为原表
-            cursor.execute(f"ALTER TABLE {temp_table_name} RENAME TO target_list")
-
-            conn.commit()
+        columns = self._conn.execute("PRAGMA table_info(target_list)").fetchall()
+        # 单列 UNIQUE 约束（如 name）只体现在自动索引上，从 index_list 中取回
+        unique_columns = set()
+        for index in self._conn.execute("PRAGMA index_list(target_list)").fetchall():
+            if index["origin"] == "u":
+                index_columns = self._conn.execute(f"PRAGMA index_info({index['name']})").fetchall()
+                if len(index_columns) == 1:
+                    unique_columns.add(index_columns[0]["name"])
+        # AUTOINCREMENT 不体现在 table_info 中，只能从原建表语句里识别；其计数器在 DROP TABLE 时
+        # 一并删除，需先记下，重建后写回，避免新记录复用已删除的 id
+        table_sql = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'target_list'").fetchone()["sql"]
+        autoincrement = "AUTOINCREMENT" in table_sql.upper()
+        pk_name = next((column["name"] for column in columns if column["pk"]), None)
+        sequence = None
+        if autoincrement:
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'target_list'").fetchone()
+            sequence = None if row is None else int(row["seq"])
+        # 保留主键、非空、唯一与默认值约束（target_orbit 依赖 id 主键），只替换目标列的类型
+        column_defs = ", ".join(
+            f"{column['name']} {new_column_type if column['name'] == column_name else column['type']}"
+            f"{' PRIMARY KEY' if column['pk'] else ''}{' AUTOINCREMENT' if column['pk'] and autoincrement else ''}"
+            f"{' NOT NULL' if column['notnull'] else ''}"
+            f"{' UNIQUE' if column['name'] in unique_columns else ''}"
+            f"{'' if column['dflt_value'] is None else ' DEFAULT ' + column['dflt_value']}"
+            for column in columns)
+        columns_str = ", ".join(column["name"] for column in columns)
+        select_str = ", ".join(f"CAST({column['name']} AS {new_column_type})" if column["name"] == column_name
+                               else column["name"] for column in columns)
+        # DROP TABLE 会一并删除索引与触发器，重建表后按原定义恢复
+        indexes = [row["sql"] for row in self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = 'target_list' "
+            "AND sql IS NOT NULL")]
+
+        # 建表、整表复制、替换与重建索引在同一个 IMMEDIATE 事务内完成，中途失败整体回滚；
+        # foreign_keys 只能在事务外切换，先关闭、结束后恢复原值
+        foreign_keys = self._conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        self._conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            self._conn.executescript(
+                "BEGIN IMMEDIATE;"
+                f"CREATE TABLE target_list_temp ({column_defs});"
+                f"INSERT INTO target_list_temp ({columns_str}) SELECT {select_str} FROM target_list;"
+                "DROP TABLE target_list;"
+                "ALTER TABLE target_list_temp RENAME TO target_list;"
+                + "".join(f"{sql};" for sql in indexes)
+                + ("" if sequence is None else
+                   "DELETE FROM sqlite_sequence WHERE name = 'target_list';"
+                   f"INSERT INTO sqlite_sequence (name, seq) SELECT 'target_list', MAX({sequence}, "
+                   f"IFNULL((SELECT MAX({pk_name}) FROM target_list), 0));")
+                + "COMMIT;")
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            raise
+        finally:
+            self._conn.execute(f"PRAGMA foreign_keys={foreign_keys}")
 
     def create_idx_priority(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_priority ON target_list(priority DESC)")
-            conn.commit()
+
+    def create_idx_hot(self):
+        """
+        为 get_top_records_by_value_limited 建立复合索引：
+        target_status 等值过滤后按 value 降序遍历索引，freeze_timestamp 直接在索引中判断，只需读取 limit 行，无需全表扫描排序
+        """
+        with self._conn as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_hot ON target_list(target_status, value DESC, freeze_timestamp)")
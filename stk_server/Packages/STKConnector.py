@@ -7,12 +7,16 @@ Author: Yin Kaifeng <yinkaifeng@cast>
 Created: 2024-06-16
 """
 
+import contextlib
 import datetime
 import math
+import numbers
 import time
 import numpy as np
+import pandas as pd
 import os
 import winreg  # 添加winreg模块导入
+from enum import StrEnum
 from pathlib import Path
 
 # This file requires Python 3.12 or later
@@ -41,6 +45,7 @@ from data_models.satellite_models import (
 from stk_server.Packages.stkutil import (
     AgEOrbitStateType,
     AgECoordinateSystem,
+    AgEExecMultiCmdResultAction,
 )
 from stk_server.Packages.stkobjects import (
     AgESTKObjectType,
@@ -55,19 +60,67 @@ from stk_server.Packages.stkobjects import (
 )
 
 from stk_server.Packages import Tools
+from stk_server.Packages.access_kernels import pass_gsd
 from utils.misc_utils import get_documents_dir, measure_time
 from tqdm import tqdm
 
+# 各方法反复使用的枚举值在模块导入时解析一次
+_SATELLITE_TYPE = AgESTKObjectType["eSatellite"]
+_MISSILE_TYPE = AgESTKObjectType["eMissile"]
+_SENSOR_TYPE = AgESTKObjectType["eSensor"]
+_LINE_TARGET_TYPE = AgESTKObjectType["eLineTarget"]
+_CLASSICAL_STATE = AgEOrbitStateType["eOrbitStateClassical"]
+_LEAD_DATA_ALL = AgELeadTrailData["eDataAll"]
+_SIMPLE_CONIC_PATTERN = AgESnPattern["eSnSimpleConic"]
+_LOS_SUN_EXCLUSION_CONSTRAINT = AgEAccessConstraints["eCstrLOSSunExclusion"]
+_LIGHTING_CONSTRAINT = AgEAccessConstraints["eCstrLighting"]
+_EXCEPTION_ON_ERROR = AgEExecMultiCmdResultAction["eExceptionOnError"]
+
+
+class STKClass(StrEnum):
+    """
+    Connect 命令与对象路径中使用的 STK 对象类名，成员与同名字符串相等，可直接用作字典键、拼接命令
+    """
+    Satellite = "Satellite"
+    Sensor = "Sensor"
+    Target = "Target"
+    Place = "Place"
+    Missile = "Missile"
+    LineTarget = "LineTarget"
+
+    @classmethod
+    def from_stk(cls, obj_type: str) -> "STKClass":
+        """
+        把 'Satellite' 或 AgESTKObjectType 风格的 'eSatellite' 统一为 STKClass，未知类名抛出 ValueError
+        """
+        if isinstance(obj_type, cls):
+            return obj_type
+        try:
+            return cls(obj_type)
+        except ValueError:
+            if obj_type.startswith("e"):
+                return cls(obj_type[1:])
+            raise
 
-from tqdm import tqdm
 
 class STKConnector:
-    def __init__(self):
+    # DataProvider 查询时只取这些数据元素
+    ECEF_ELEMENTS = ("Time", "x", "y", "z")
+    LLA_ELEMENTS = ("Time", "Lat", "Lon", "Alt")
+    AER_ELEMENTS = ("Elevation", "Range")
+    # add_satellite 中 HPOP 模板卫星的名称
+    HPOP_TEMPLATE_NAME = "MCP_HPOP_Template"
+    # UnitPreferences 中 DateFormat 设为 UTCG 后 STK 返回的时间字符串格式，如 '22 Mar 2025 06:15:58.220'
+    UTCG_FORMAT = "%d %b %Y %H:%M:%S.%f"
+
+    def __init__(self, early_binding: bool = False):
         """
         初始化STKConnector类，创建STK应用实例并获取IAgStkObjectRoot接口
 
         Args:
-            无参数
+            early_binding (bool, optional): 是否使用 gencache.EnsureDispatch 早绑定 COM 接口。
+                早绑定按类型库直接调用，省去每次属性访问的 GetIDsOfNames，但返回的子对象只具有声明的接口类型，
+                派生接口需 CastTo 后才能访问，因此默认关闭
 
         Returns:
             无返回值
@@ -76,6 +129,18 @@ class STKConnector:
         self.scenario_begin_time = ""
         self.scenario_end_time = ""
         self.earth_radius = 6371  # km
+        # 场景对象每次增删时递增，用于使缓存的对象、DataProvider 句柄失效
+        self._scene_gen = 0
+        # (对象路径, DataProvider 名称, 分组) -> DataProvider 句柄
+        self._data_provider_cache = {}
+        # 对象类型 -> get_objects 返回的路径列表
+        self._objects_cache = {}
+        # get_satellite_sensor 解析好的传感器列表
+        self._sensors_cache = None
+        # 对象路径 -> GetObjectFromPath 返回的对象句柄
+        self._object_cache = {}
+        # (场景开始时间, 视场角) -> 各卫星的地面覆盖幅宽
+        self._imaging_swath_cache = {}
 
         # 获取当前的场景
         try:
@@ -83,10 +148,22 @@ class STKConnector:
         except Exception as e:
             print(f"Get STK11.Application object error {e}")
 
+        if early_binding:
+            # 首次运行时由 makepy 生成类型库包装（缓存于 gen_py），此后直接按 DISPID 调用；生成失败时退回晚绑定
+            try:
+                uiApp = win32com.client.gencache.EnsureDispatch(uiApp)
+            except Exception as e:
+                print(f"EnsureDispatch STK12.Application error {e}, using late binding")
+
         uiApp.Visible = True
         uiApp.UserControl = True  # 可以用鼠标和STK GUI交互
 
         self.root = uiApp.Personality2
+        if early_binding:
+            try:
+                self.root = win32com.client.gencache.EnsureDispatch(self.root)
+            except Exception as e:
+                print(f"EnsureDispatch IAgStkObjectRoot error {e}, using late binding")
         # 获取STK安装路径
         stk_versions = ["12.0", "11.0"]  # 尝试多个STK版本
         self.stk_install_path = None
@@ -111,17 +188,35 @@ class STKConnector:
         self.root.UnitPreferences.SetCurrentUnit("DateFormat", "UTCG")
 
         # Create new scenario
-        try:
+        # 直接查询当前场景是否存在，不再靠 NewScenario 抛出 COM 异常来判断
+        self.scenario = self.root.CurrentScenario
+        if self.scenario is None:
             print("Creating scenario...")
-            self.scenario = self.root.CloseScenario
             self.root.NewScenario("MCP_Created_Scenario")
-            # 获取当前场景的时间
-        except Exception as e:
-            print(f"     ↳ Info: {e.excepinfo[2]}")
-            print(f"Scenario existed, using current scenario...")
             self.scenario = self.root.CurrentScenario
-            self.scenario_begin_time = self.scenario.StartTime
-            self.scenario_end_time = self.scenario.StopTime
+        else:
+            print(f"Scenario existed, using current scenario...")
+        # 获取当前场景的时间
+        self.scenario_begin_time = self.scenario.StartTime
+        self.scenario_end_time = self.scenario.StopTime
+
+    @property
+    def scenario_begin_time(self):
+        return self._scenario_begin_time
+
+    @scenario_begin_time.setter
+    def scenario_begin_time(self, scenario_begin_time):
+        """
+        场景开始时间的所有赋值都经过这里，同时缓存其毫秒、秒级时间戳，
+        各方法直接使用 _scenario_begin_ms / _scenario_begin_s，不再在循环中反复解析时间字符串
+        """
+        self._scenario_begin_time = scenario_begin_time
+        if scenario_begin_time:
+            self._scenario_begin_ms = Tools.get_ms_timestamp_by_date_string(scenario_begin_time)
+            self._scenario_begin_s = Tools.get_timestamp_by_date_string(scenario_begin_time)
+        else:
+            self._scenario_begin_ms = None
+            self._scenario_begin_s = None
 
     def set_scenario_time(self, scenario_begin_time, scenario_end_time):
         """
@@ -151,7 +246,8 @@ class STKConnector:
         self.scenario_end_time = scenario_end_time
 
     def get_satellite_ecef_by_time_shift(
-        self, start_time_shift: float, period: float, step=0.125, ret_single_point=True, instance_names=None
+        self, start_time_shift: float, period: float, step=0.125, ret_single_point=True, instance_names=None,
+        return_format="aos"
     ) -> Dict[str, List[Tuple[str, float, float, float]]]:
         """根据时间偏移量获取指定卫星的ECEF坐标。
 
@@ -166,6 +262,10 @@ class STKConnector:
                 默认为True，仅返回第一个点
             instance_names (List[str], optional): 指定要获取坐标的卫星实例名称列表。
                 如果为None，则获取所有卫星的坐标
+            return_format (str, optional): 返回数据的组织方式，默认为"aos"。
+                "aos" 时每个卫星为 (时间, x, y, z) 元组列表；
+                "soa" 时每个卫星为 {"t": 时间字符串列表, "xyz": (N, 3) 的 np.ndarray}，
+                不逐点构造元组，便于后续直接做数组运算
 
         Returns:
             dict: 以卫星名称为键的字典，值为卫星位置数据列表。
@@ -175,6 +275,7 @@ class STKConnector:
 
                 若ret_single_point为True，则每个卫星的列表仅包含一个元组
                 若ret_single_point为False，则包含整个时间段内按step采样的所有点
+                return_format为"soa"时值的结构见上
 
         Note:
             ECEF (Earth-Centered, Earth-Fixed) 是一个以地球质心为原点，
@@ -183,42 +284,33 @@ class STKConnector:
         """
         # 获取场景中的所有卫星对象
         paths = self.get_objects("Satellite")
+        if instance_names is not None:
+            instance_names = set(instance_names)
+
+        # 起止时间与卫星无关，循环外只计算一次
+        orbit_begin_timestamp = self._scenario_begin_ms + start_time_shift
+        orbit_begin_time = Tools.get_date_string_by_timestamp(orbit_begin_timestamp)
+        orbit_end_time = Tools.get_date_string_by_timestamp(orbit_begin_timestamp + period)
+        # 只需第一个点时让 STK 只计算起始时刻，不再计算、传回整段时间的采样
+        if ret_single_point:
+            orbit_end_time = orbit_begin_time
+
         resp = {}
-        for path in tqdm(paths, desc="Calculating satellite ECEF"):
-            satellite = self.root.GetObjectFromPath(path)
-            satellite_name = satellite.InstanceName
-            
+        for path in tqdm(paths, desc="Calculating satellite ECEF", mininterval=0.5):
+            # 路径末段即实例名，先按名称过滤，不需要的卫星不再经 COM 取对象
+            satellite_name = path.rsplit("/", 1)[-1]
+
             # 如果指定了instance_names，只处理指定的卫星
             if instance_names is not None and satellite_name not in instance_names:
                 continue
-                
-            print(f"处理satellite: {satellite_name}")
-            orbit_begin_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift
-            )
-            orbit_end_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift + period
-            )
 
-            satelliteDP = satellite.DataProviders.Item("Cartesian Position").Group.Item("Fixed")
-            result = satelliteDP.Exec(orbit_begin_time, orbit_end_time, step)
-            times = result.DataSets.GetDataSetByName("Time").GetValues()
-            x_pos = result.DataSets.GetDataSetByName("x").GetValues()
-            y_pos = result.DataSets.GetDataSetByName("y").GetValues()
-            z_pos = result.DataSets.GetDataSetByName("z").GetValues()
-            _temp = []
-            for t, x, y, z in zip(times, x_pos, y_pos, z_pos):
-                _temp.append(
-                    (
-                        Tools.get_date_string_by_timestamp(Tools.get_ms_timestamp_by_date_string(t)),
-                        round(x, 3),
-                        round(y, 3),
-                        round(z, 3),
-                    )
-                )
-                if ret_single_point:
-                    break
-            resp.update({satellite_name: _temp})
+            times, xyz = self._position_arrays(
+                path, "Cartesian Position", self.ECEF_ELEMENTS, orbit_begin_time, orbit_end_time, step, ret_single_point
+            )
+            if return_format == "soa":
+                resp[satellite_name] = {"t": times, "xyz": xyz}
+            else:
+                resp[satellite_name] = list(zip(times, *xyz.T.tolist()))
 
         return resp
 
@@ -255,45 +347,120 @@ class STKConnector:
         paths = self.get_objects("Satellite")
         resp = {}
 
-        for path in paths:
-            satellite = self.root.GetObjectFromPath(path)
+        # 计算开始和结束时间，与卫星无关，循环外只计算一次
+        orbit_begin_time = Tools.get_date_string_by_timestamp(self._scenario_begin_ms + start_time_shift)
+        orbit_end_time = Tools.get_date_string_by_timestamp(self._scenario_begin_ms + start_time_shift + period)
+        # 只需第一个点时让 STK 只计算起始时刻，不再计算、传回整段时间的采样
+        if ret_single_point:
+            orbit_end_time = orbit_begin_time
 
-            # 计算开始和结束时间
-            orbit_begin_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift
-            )
-            orbit_end_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift + period
+        for path in paths:
+            # 获取LLA数据提供器并执行查询，将该卫星的数据添加到结果字典中
+            times, lla = self._position_arrays(
+                path, "LLA State", self.LLA_ELEMENTS, orbit_begin_time, orbit_end_time, step, ret_single_point
             )
+            resp[path.rsplit("/", 1)[-1]] = list(zip(times, *lla.T.tolist()))
 
-            # 获取LLA数据提供器并执行查询
-            satelliteDP = satellite.DataProviders.Item("LLA State").Group.Item("Fixed")
-            result = satelliteDP.Exec(orbit_begin_time, orbit_end_time, step)
-
-            # 获取时间、经纬度和高度数据
-            times = result.DataSets.GetDataSetByName("Time").GetValues()
-            lat_pos = result.DataSets.GetDataSetByName("Lat").GetValues()
-            lon_pos = result.DataSets.GetDataSetByName("Lon").GetValues()
-            alt_pos = result.DataSets.GetDataSetByName("Alt").GetValues()
-
-            # 构建该卫星的位置数据列表
-            satellite_data = []
-            for t, lat, lon, alt in zip(times, lat_pos, lon_pos, alt_pos):
-                satellite_data.append(
-                    (
-                        Tools.get_date_string_by_timestamp(Tools.get_ms_timestamp_by_date_string(t)),
-                        round(lat, 3),
-                        round(lon, 3),
-                        round(alt, 3),
-                    )
-                )
-                if ret_single_point:
-                    break
+        return resp
+
+    def _scene_changed(self):
+        """
+        场景中的对象发生增删后调用，使缓存的对象、DataProvider 句柄失效
+        """
+        self._scene_gen += 1
+        self._data_provider_cache.clear()
+        self._objects_cache.clear()
+        self._sensors_cache = None
+        self._object_cache.clear()
+        self._imaging_swath_cache.clear()
+
+    @staticmethod
+    def _parse_path(path: str) -> Dict[str, str]:
+        """
+        把对象路径解析为 {对象类型: 对象名称}，路径从末尾起按 "类型/名称" 成对排列，如
+        '/Application/STK/Scenario/S1/Satellite/sat1/Sensor/s1' ->
+        {'Sensor': 's1', 'Satellite': 'sat1', 'Scenario': 'S1', 'Application': 'STK'}
+        """
+        parts = path.split("/")
+        return dict(zip(parts[-2::-2], parts[::-2]))
 
-            # 将该卫星的数据添加到结果字典中
-            resp[satellite.InstanceName] = satellite_data
+    def _get_object(self, path: str):
+        """
+        按对象路径获取对象句柄并缓存，同一对象在多次计算中只经 COM 解析一次路径
+        """
+        obj = self._object_cache.get(path)
+        if obj is None:
+            obj = self.root.GetObjectFromPath(path)
+            self._object_cache[path] = obj
+        return obj
 
-        return resp
+    def _unload_object(self, path: str):
+        """
+        卸载对象，并丢弃该对象及其子对象的缓存句柄
+        """
+        self._get_object(path).Unload()
+        child_prefix = path + "/"
+        for cached_path in [p for p in self._object_cache if p == path or p.startswith(child_prefix)]:
+            del self._object_cache[cached_path]
+
+    def _get_data_provider(self, path: str, provider_name: str, group: str = None):
+        """
+        按对象路径获取 DataProvider 句柄并缓存，重复查询同一对象时不再经 COM 逐级解析
+        GetObjectFromPath -> DataProviders.Item -> Group.Item
+
+        Args:
+            path (str): 对象路径
+            provider_name (str): DataProvider 名称
+            group (str, optional): 分组名称，如 "Fixed"；为None时直接返回 DataProvider
+
+        Returns:
+            DataProvider 句柄
+        """
+        key = (path, provider_name, group)
+        data_provider = self._data_provider_cache.get(key)
+        if data_provider is None:
+            data_provider = self._get_object(path).DataProviders.Item(provider_name)
+            if group is not None:
+                data_provider = data_provider.Group.Item(group)
+            self._data_provider_cache[key] = data_provider
+        return data_provider
+
+    def _position_arrays(
+        self, path: str, provider_name: str, elements: Tuple[str, ...], begin_time: str, end_time: str, step,
+        ret_single_point: bool
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        对单颗卫星执行位置类 DataProvider（Fixed 坐标系），整理为时间列表与 (N, 3) 分量数组
+
+        ECEF、LLA 查询共用；每颗卫星的工作互不依赖，全部封装在这里。
+        STK 对象模型只能在创建它的线程（STA 单元）中调用，跨线程并发调用会在 STK 内部串行排队，
+        因此各卫星仍按顺序逐个查询。
+
+        Args:
+            path (str): 卫星对象路径
+            provider_name (str): DataProvider 名称，如 "Cartesian Position"、"LLA State"
+            elements (Tuple[str, ...]): 时间与三个分量的数据元素名
+            begin_time (str): 查询开始时间
+            end_time (str): 查询结束时间
+            step (float): 时间采样步长，单位为秒
+            ret_single_point (bool): 是否只返回第一个时间点
+
+        Returns:
+            Tuple[List[str], np.ndarray]: 规整后的时间字符串列表，以及保留3位小数的 (N, 3) 分量数组
+        """
+        satelliteDP = self._get_data_provider(path, provider_name, "Fixed")
+        # 只请求用到的四个数据元素，减少 STK 计算与跨 COM 传输的数据量
+        result = satelliteDP.ExecElements(begin_time, end_time, step, elements)
+        times, *components = (result.DataSets.GetDataSetByName(name).GetValues() for name in elements)
+        if ret_single_point:
+            times = times[:1]
+            components = [component[:1] for component in components]
+
+        # 时间字符串整批规整，各分量按列堆叠后整体四舍五入，不再逐点调用 round
+        values = np.empty((len(times), 3), dtype=np.float64)
+        for column, component in enumerate(components):
+            values[:, column] = component
+        return Tools.normalize_date_strings(times), np.round(values, 3)
 
     def calculate_sensor_fov_imaging_swath(
         self, sensor_info: PayloadInfo, satellite_ecef_data: Dict[str, List[Tuple[str, float, float, float]]]
@@ -308,6 +475,7 @@ class STKConnector:
                     "satellite_name1": [(time, x, y, z), ...],
                     "satellite_name2": [(time, x, y, z), ...],
                 }
+                也可以是 get_satellite_ecef_by_time_shift(return_format="soa") 的返回值
 
         Returns:
             Dict[str, float]: 每个卫星载荷的地面覆盖幅宽(km)
@@ -320,25 +488,44 @@ class STKConnector:
             - 地面覆盖幅宽基于卫星高度和载荷视场角计算
             - 使用地球平均半径6371km作为参考
         """
-        resp = {}
-        # 提取卫星坐标
-        for satellite_name, ecef_data in satellite_ecef_data.items():
-            x_s, y_s, z_s = ecef_data[0][1], ecef_data[0][2], ecef_data[0][3]
+        if not satellite_ecef_data:
+            return {}
 
-            # 计算卫星到地球中心的距离（模长）
-            distance_to_center = math.sqrt(x_s**2 + y_s**2 + z_s**2)
+        # 提取各卫星第一个时间点的坐标，堆叠为 (N, 3) 数组后整体计算
+        ecef_values = list(satellite_ecef_data.values())
+        if isinstance(ecef_values[0], dict):
+            positions = np.stack([ecef_data["xyz"][0] for ecef_data in ecef_values])
+        else:
+            positions = np.array([ecef_data[0][1:4] for ecef_data in ecef_values], dtype=np.float64)
 
-            # 计算卫星的高度（轨道高度）
-            orbit_height = distance_to_center - self.earth_radius
+        # 卫星到地球中心的距离（模长）减去地球半径即为轨道高度
+        orbit_height = np.linalg.norm(positions, axis=1) - self.earth_radius
 
-            # 将视场半角转换为弧度
-            fov_half_angle_rad = math.radians(sensor_info.fov_angle)
+        # 视场半角只需转换一次，计算地面覆盖半径
+        imaging_swath = np.round(orbit_height * math.tan(math.radians(sensor_info.fov_angle)), 2)
 
-            # 计算地面覆盖半径
-            imaging_swath = round(orbit_height * math.tan(fov_half_angle_rad), 2)
-            resp.update({satellite_name: imaging_swath})
+        return dict(zip(satellite_ecef_data.keys(), imaging_swath.tolist()))
 
-        return resp
+    def _imaging_swath(self, sensor_info: PayloadInfo) -> Dict[str, float]:
+        """
+        各卫星在场景开始时刻的地面覆盖幅宽，只取决于卫星位置与载荷视场角；
+        卫星未增删、场景开始时间与视场角不变时直接复用上次的结果，不再经 STK 重新取 ECEF 坐标
+        """
+        key = (self.scenario_begin_time, sensor_info.fov_angle)
+        imaging_swath = self._imaging_swath_cache.get(key)
+        if imaging_swath is None:
+            propagation_data_ecef = self.get_satellite_ecef_by_time_shift(
+                start_time_shift=0,  # start_time_shift
+                period=12,
+                step=1,
+                ret_single_point=True,
+                return_format="soa",
+            )
+            imaging_swath = self.calculate_sensor_fov_imaging_swath(
+                sensor_info=sensor_info, satellite_ecef_data=propagation_data_ecef
+            )
+            self._imaging_swath_cache[key] = imaging_swath
+        return imaging_swath
 
     def get_satellite_pass_data(self, epoch: int = 30) -> Dict:
         """获取卫星过境数据，包括轨道特性和降交点信息。
@@ -365,20 +552,21 @@ class STKConnector:
 
         # 获取场景中的所有卫星对象
         paths = self.get_objects("Satellite")
-        for path in paths:
-            satellite = self.root.GetObjectFromPath(path)
-
-            # 获取卫星数据提供器，用于计算过境数据
-            satelliteDP = satellite.DataProviders.Item("Passes")
 
-            # 计算场景结束时间（当前时间+epoch天）
-            scenario_end_time = Tools.get_date_string_by_timestamp(
-                Tools.get_timestamp_by_date_string(self.scenario_begin_time) + epoch * 86400  # epoch天的秒数
-            )
+        # 计算场景结束时间（当前时间+epoch天），与卫星无关，循环外只计算一次
+        scenario_end_time = Tools.get_date_string_by_timestamp(
+            self._scenario_begin_s + epoch * 86400  # epoch天的秒数
+        )
 
-            # 设置当前场景的时间范围
+        # 设置当前场景的时间范围；场景已是该时间范围时不再重置，避免多余的 Animate * Reset
+        current_period = Tools.normalize_date_strings([self.scenario.StartTime, self.scenario.StopTime])
+        if current_period != Tools.normalize_date_strings([self.scenario_begin_time, scenario_end_time]):
             self.set_scenario_time(self.scenario_begin_time, scenario_end_time)
 
+        for path in paths:
+            # 获取卫星数据提供器，用于计算过境数据
+            satelliteDP = self._get_data_provider(path, "Passes")
+
             # 执行数据查询，获取卫星过境数据
             result = satelliteDP.Exec(self.scenario_begin_time, scenario_end_time)
 
@@ -391,13 +579,14 @@ class STKConnector:
             # 如果场景的开始时间不是卫星的降交点时间，则需要判断后面的数据是不是在pass里面
             raw_lon_descen_node = result.DataSets.GetDataSetByName("Lon Descen Node").GetValues()
             raw_time_of_descen_node = result.DataSets.GetDataSetByName("Time of Descen Node").GetValues()
-            valid_pass_index = 0
-            for x in raw_lon_descen_node:
-                try:
-                    float(x)
-                    break
-                except:
-                    valid_pass_index += 1
+            # 非数值（如场景开始时尚未完整的 pass 对应的空值字符串）之后的第一个数值即有效 pass，
+            # 直接按类型判断，不再用 float() 抛异常来探测
+            valid_pass_index = next(
+                (idx for idx, x in enumerate(raw_lon_descen_node) if isinstance(x, numbers.Real)), None
+            )
+            if valid_pass_index is None:
+                # 没有任何有效的降交点数据，跳过该卫星
+                continue
 
             # 获取降交点时间（卫星穿过赤道从北向南的时刻）
             time_of_descen_node = raw_time_of_descen_node[valid_pass_index:-1]
@@ -405,40 +594,20 @@ class STKConnector:
             # 获取降交点经度
             lon_descen_node = raw_lon_descen_node[valid_pass_index:-1]
 
-            # 格式化时间字符串，保留3位小数
-            formatted_times = []
-            for t in time_of_descen_node:
-                timestamp = Tools.get_ms_timestamp_by_date_string(t)
-                formatted_time = Tools.get_date_string_by_timestamp(timestamp)
-                formatted_times.append(formatted_time)
-
-            # 解析UTC时间字符串为datetime对象
-            utc_time = datetime.datetime.strptime(
-                Tools.get_date_string_by_timestamp(
-                    Tools.get_ms_timestamp_by_date_string(time_of_descen_node[0])
-                ),
-                "%d %b %Y %H:%M:%S.%f",
-            )
+            # 格式化时间字符串，保留3位小数，整批规整
+            formatted_times = Tools.normalize_date_strings(time_of_descen_node)
+
+            # 解析UTC时间字符串为datetime对象，直接使用已规整的第一个降交点时间，不再重复解析
+            utc_time = datetime.datetime.strptime(formatted_times[0], self.UTCG_FORMAT)
             # 计算地方时偏移（经度/15小时） 360度/24小时=15度/小时
-            offset = datetime.timedelta(hours=lon_descen_node[0] / 15)
-            # 加上偏移
-            local_time = utc_time + offset
-            # 地方时在24小时制内循环
-            lon_descen_node_local_time = (
-                local_time.strftime("%H:%M")
-                if local_time.hour >= 0
-                else local_time + datetime.timedelta(days=1)
-            )
-            lon_descen_node_local_time = (
-                local_time.strftime("%H:%M")
-                if local_time.hour < 24
-                else local_time - datetime.timedelta(days=1)
-            )
+            # datetime 加减偏移时自动跨日，只取时分即为24小时制内循环的地方时
+            local_time = utc_time + datetime.timedelta(hours=lon_descen_node[0] / 15)
+            lon_descen_node_local_time = local_time.strftime("%H:%M")
 
             # 构造并返回结果字典
             resp.update(
                 {
-                    satellite.InstanceName: {
+                    path.rsplit("/", 1)[-1]: {
                         "min_lat": min_lat,  # 轨道最小纬度
                         "max_lat": max_lat,  # 轨道最大纬度
                         "descending_node": list(zip(formatted_times, lon_descen_node)),  # 降交点经度
@@ -475,7 +644,6 @@ class STKConnector:
             pass_data = calculate_satellite_pass()
         """
         path = self.get_objects("Satellite")
-        satellite = self.root.GetObjectFromPath(path[0])
         # satelliteDP = satellite.DataProviders.Item('LLR State').Group.Item('Fixed')
         # result = satelliteDP.Exec(self.scenario_begin_time, self.scenario_end_time, 60)
         # times = result.DataSets.GetDataSetByName('Time').GetValues()
@@ -484,26 +652,23 @@ class STKConnector:
         #
         # resp = list(zip(times, lat_pos, lon_pos))
 
-        satelliteDP = satellite.DataProviders.Item("Pass Event Times")
+        satelliteDP = self._get_data_provider(path[0], "Pass Event Times")
         result = satelliteDP.Exec(self.scenario_begin_time, self.scenario_end_time)
         descen_times = result.DataSets.GetDataSetByName("Time of Descen Node").GetValues()
 
-        pass_data = []
-        for idx, t in enumerate(descen_times):
-            current_pass_descending_t = Tools.get_timestamp_by_date_string(t)
-            if idx < len(descen_times) - 1:
-                delta_t = (
-                    Tools.get_timestamp_by_date_string(descen_times[idx + 1]) - current_pass_descending_t
-                ) / 2
-            else:
-                delta_t = (
-                    current_pass_descending_t - Tools.get_timestamp_by_date_string(descen_times[idx - 1])
-                ) / 2
-            current_pass = [
-                Tools.get_date_string_by_timestamp(int(current_pass_descending_t - delta_t)),
-                Tools.get_date_string_by_timestamp(int(current_pass_descending_t + delta_t)),
-            ]
-            pass_data.append({idx: current_pass})
+        # 每个降交点时间只解析一次，相邻降交点间隔的一半即为过境窗口的半宽，最后一次过境沿用前一个间隔
+        descen_timestamps = np.fromiter(
+            (Tools.get_timestamp_by_date_string(t) for t in descen_times), dtype=np.int64, count=len(descen_times)
+        )
+        half_intervals = np.diff(descen_timestamps) / 2
+        delta_t = np.append(half_intervals, half_intervals[-1] if len(half_intervals) else 0.0)
+        pass_begin = (descen_timestamps - delta_t).astype(np.int64).tolist()
+        pass_end = (descen_timestamps + delta_t).astype(np.int64).tolist()
+
+        pass_data = [
+            {idx: [Tools.get_date_string_by_timestamp(begin), Tools.get_date_string_by_timestamp(end)]}
+            for idx, (begin, end) in enumerate(zip(pass_begin, pass_end))
+        ]
 
         return pass_data
 
@@ -579,89 +744,142 @@ class STKConnector:
 
         """
         start_time = time.time()
-        # 关闭stk中的界面显示，提高添加点的性能
-        if not stk_sync_show:
-            self.root.BeginUpdate()
-        # delete all exists targets before insert new target
-        if delete_origin_targets:
-            self.delete_objects(obj_type=obj_type, delete_all=True)
-
-        default_altitude = 0
-
-        len_obj_list = len(obj_list)
-        for idx, obj in tqdm(enumerate(obj_list), desc="Adding objects"):
+        obj_target_names = []
+        for obj in obj_list:
             try:
                 if type(obj.target_name) is List:
-                    obj_target_name = obj.target_name[0]
+                    obj_target_names.append(str(obj.target_name[0]))
                 else:
-                    obj_target_name = obj.target_name
+                    obj_target_names.append(str(obj.target_name))
             except Exception as e:
                 raise BaseException(f"解析target_name失败：{e}")
 
-            target = self.scenario.Children.New(AgESTKObjectType[obj_type], str(obj_target_name))
-            target.Graphics.LabelVisible = False
-            target.Position.AssignGeodetic(obj.target_coords[0], obj.target_coords[1], obj.target_coords[2])
-
-            if echo:
-                print(
-                    f"\r Process: {idx / len_obj_list * 100:.2f}%, add {obj_type}-{obj_target_name},"
-                    f" Longitude={obj.target_coords[1]}, Latitude={obj.target_coords[0]}",
-                    end="",
-                )
-
-            # 设置目标约束
-            target_constraints = target.AccessConstraints
-            light = target_constraints.AddConstraint(AgEAccessConstraints["eCstrLighting"])
-            light.Condition = AgECnstrLighting["eUmbraOrDirectSun"]
-            target.UseTerrain = False
-
-            if obj_type == "Place":
-                target.Graphics.LabelColor = 16777215  # 白色
-            target.Graphics.LabelVisible = label_visible
-            target.HeightAboveGround = 0
-
-        # 结束更新，打开界面显示
+        # 关闭stk中的界面显示，提高添加点的性能
         if not stk_sync_show:
-            self.root.EndUpdate()
+            self.root.BeginUpdate()
+        try:
+            self._add_objects(obj_type, obj_list, obj_target_names, label_visible, echo, delete_origin_targets)
+        finally:
+            self._scene_changed()
+            # 结束更新，打开界面显示；创建中途出错也不能让界面一直停在暂停刷新状态
+            if not stk_sync_show:
+                self.root.EndUpdate()
 
         end_time = time.time()
         execution_time = end_time - start_time
         ic(execution_time)
 
+    def _add_objects(self, obj_type: str, obj_list: List, obj_target_names: List[str], label_visible: bool,
+                     echo: bool, delete_origin_targets: bool):
+        """
+        add_objects 的实际创建逻辑：Connect 命令批量创建对象，再逐个设置地形与标签
+        """
+        # delete all exists targets before insert new target
+        if delete_origin_targets:
+            self.delete_objects(obj_type=obj_type, delete_all=True)
+
+        # 对象创建、位置与光照约束以 Connect 命令批量下发，每批只有一次 COM 调用，
+        # 不再逐个对象调用 Children.New / AssignGeodetic / AddConstraint
+        class_name = STKClass.from_stk(obj_type)
+        commands = []
+        for obj_target_name, obj in zip(obj_target_names, obj_list):
+            obj_path = f"*/{class_name}/{obj_target_name}"
+            commands.append(f"New / {obj_path}")
+            # Connect 命令的距离单位为米，target_coords 中的高度为千米
+            commands.append(
+                f"SetPosition {obj_path} Geodetic {obj.target_coords[0]} {obj.target_coords[1]} "
+                f"{obj.target_coords[2] * 1000}"
+            )
+            commands.append(f"SetConstraint {obj_path} Lighting UmbraOrDirectSun")
+        self.execute_connect_commands(commands)
+
+        # 与具体对象无关的类型判断在循环外完成
+        label_color = 16777215 if class_name is STKClass.Place else None  # Place 标签为白色
+        children = self.scenario.Children
+        # 新建对象都是场景的直接子对象，按实例名从 Children 取句柄，不经路径解析；
+        # 图形属性在 BatchGraphics 内修改，退出时统一刷新一次
+        # 进度由 tqdm 显示（echo 为 False 时关闭），给出 total 避免逐次估算长度，并降低刷新频率
+        with self._batch_graphics():
+            for obj_target_name in tqdm(
+                obj_target_names, total=len(obj_target_names), desc="Adding objects", disable=not echo,
+                mininterval=0.5
+            ):
+                target = children.Item(obj_target_name)
+
+                # 不使用地形时 HeightAboveGround 不起作用（新建对象默认即为0），不再单独设置
+                target.UseTerrain = False
+
+                graphics = target.Graphics
+                if label_color is not None:
+                    graphics.LabelColor = label_color
+                graphics.LabelVisible = label_visible
+
+    @contextlib.contextmanager
+    def _batch_graphics(self):
+        """
+        在 with 块内开启 STK 的 BatchGraphics，逐个对象的图形属性修改只在退出时统一刷新一次，
+        与 BeginUpdate/EndUpdate 互补：后者只在 stk_sync_show=False 时关闭界面更新
+        """
+        self.root.ExecuteCommand("BatchGraphics * On")
+        try:
+            yield
+        finally:
+            self.root.ExecuteCommand("BatchGraphics * Off")
+
+    def execute_connect_commands(self, commands: List[str], batch_size: int = 1000):
+        """
+        分批执行 Connect 命令，每批通过一次 ExecuteMultipleCommands 调用下发
+
+        Args:
+            commands (List[str]): Connect 命令列表
+            batch_size (int, optional): 每批命令数，默认为1000
+
+        Returns:
+            None
+        """
+        for begin in range(0, len(commands), batch_size):
+            self.root.ExecuteMultipleCommands(
+                commands[begin: begin + batch_size], _EXCEPTION_ON_ERROR
+            )
+
     def add_missile(self, missile_info: List[MissileInfo]):
         """
         增加导弹到STK
         Args:
             missile_info: List[MissileInfo]类型，包含导弹的轨道信息等数据
         """
-        for missile_info_ in tqdm(missile_info, desc="添加导弹"):
-            try:
-                missile = self.scenario.Children.New(AgESTKObjectType["eMissile"], missile_info_.name)
-            except Exception as e:
-                self.delete_objects("eMissile", obj_list=[missile_info_.model_dump()], delete_all=False)
-                missile = self.scenario.Children.New(AgESTKObjectType["eMissile"], missile_info_.name)
-            missile.SetTrajectoryType(AgEVePropagatorType.ePropagatorBallistic)  # ePropagatorBallistic
-            trajectory = missile.Trajectory
-            trajectory.EphemerisInterval.SetExplicitInterval(
-                Tools.get_date_string_by_timestamp(
-                    Tools.get_timestamp_by_date_string(self.scenario_begin_time)
-                    + missile_info_.trajectory_epoch_second
-                ),
-                Tools.get_date_string_by_timestamp(
-                    Tools.get_timestamp_by_date_string(self.scenario_begin_time)
-                    + missile_info_.trajectory_epoch_second
-                ),
-            )  # stop time later computed based on propagation
-            trajectory.Launch.Lat = missile_info_.latitude  # deg
-            trajectory.Launch.Lon = missile_info_.longitude  # deg
-            trajectory.ImpactLocation.Impact.Lat = missile_info_.impact_latitude  # deg
-            trajectory.ImpactLocation.Impact.Lon = missile_info_.impact_longitude  # deg
-            trajectory.ImpactLocation.SetLaunchControlType(0)  # eLaunchControlFixedApogeeAlt
-            trajectory.ImpactLocation.LaunchControl.ApogeeAlt = missile_info_.altitude  # km
-            trajectory.Propagate()
-            # 设置3D视图的地面轨迹不显示
-            missile.VO.Trajectory.TrackData.PassData.GroundTrack.SetLeadDataType(0)
-            missile.VO.Trajectory.TrackData.PassData.GroundTrack.SetTrailDataType(0)
+        ballistic_type = AgEVePropagatorType.ePropagatorBallistic
+        try:
+            for missile_info_ in tqdm(missile_info, desc="添加导弹", mininterval=0.5):
+                # 弹道起算时刻，由缓存的场景开始时间戳推算
+                epoch_time = Tools.get_date_string_by_timestamp(
+                    self._scenario_begin_s + missile_info_.trajectory_epoch_second
+                )
+                try:
+                    missile = self.scenario.Children.New(_MISSILE_TYPE, missile_info_.name)
+                except Exception as e:
+                    # delete_objects 只按名称匹配，不必把整个导弹模型转成字典
+                    self.delete_objects("eMissile", obj_list=[{"name": missile_info_.name}], delete_all=False)
+                    missile = self.scenario.Children.New(_MISSILE_TYPE, missile_info_.name)
+                missile.SetTrajectoryType(ballistic_type)  # ePropagatorBallistic
+                trajectory = missile.Trajectory
+                trajectory.EphemerisInterval.SetExplicitInterval(
+                    epoch_time, epoch_time
+                )  # stop time later computed based on propagation
+                trajectory.Launch.Lat = missile_info_.latitude  # deg
+                trajectory.Launch.Lon = missile_info_.longitude  # deg
+                trajectory.ImpactLocation.Impact.Lat = missile_info_.impact_latitude  # deg
+                trajectory.ImpactLocation.Impact.Lon = missile_info_.impact_longitude  # deg
+                trajectory.ImpactLocation.SetLaunchControlType(0)  # eLaunchControlFixedApogeeAlt
+                trajectory.ImpactLocation.LaunchControl.ApogeeAlt = missile_info_.altitude  # km
+                trajectory.Propagate()
+                # 设置3D视图的地面轨迹不显示
+                ground_track = missile.VO.Trajectory.TrackData.PassData.GroundTrack
+                ground_track.SetLeadDataType(0)
+                ground_track.SetTrailDataType(0)
+        finally:
+            # 中途失败时已创建的导弹也要进入缓存，否则后续按缓存查询会漏掉它们
+            self._scene_changed()
             
 
     def add_satellite(
@@ -712,127 +930,129 @@ class STKConnector:
         # 关闭stk中的界面显示，提高添加点的性能
         if not stk_sync_show:
             self.root.BeginUpdate()
-
-        # 获取场景中现有的卫星
+        try:
+            self._add_satellite(satellite_info, hpop, delete_duplicate_targets)
+        finally:
+            self._scene_changed()
+            # 结束更新，打开界面显示；创建中途出错也不能让界面一直停在暂停刷新状态
+            if not stk_sync_show:
+                self.root.EndUpdate()
+
+    def _add_satellite(self, satellite_info: List[SatelliteInfo], hpop: bool, delete_duplicate_targets: bool):
+        """
+        add_satellite 的实际创建逻辑：与场景中现有卫星比对，只删除、创建有差异的部分
+        """
+        # 获取场景中现有的卫星，路径末段即实例名
         obj_type = "Satellite"
-        existing_satellites = {}
-        self.delete_objects("Satellite", delete_all=True)
-        # for path in self.get_objects(obj_type):
-        #     if path != "None":
-        #         stk_satellite = self.root.GetObjectFromPath(path)
-        #         existing_satellites[stk_satellite.InstanceName] = path
-
-        # # 处理卫星删除和过滤
-        # satellites_to_create = []
-        # for sate in satellite_info:
-        #     if sate.name in existing_satellites:
-        #         if delete_duplicate_targets:
-        #             # 如果需要删除重复的卫星，则删除场景中的卫星
-        #             target = self.root.GetObjectFromPath(existing_satellites[sate.name])
-        #             target.Unload()
-        #             satellites_to_create.append(sate)
-        #     else:
-        #         # 如果场景中没有这个卫星，则添加到待创建列表
-        #         satellites_to_create.append(sate)
+        existing_satellites = {
+            path.rsplit("/", 1)[-1]: path for path in self.get_objects(obj_type) if path != "None"
+        }
+        new_names = {str(sate.name) for sate in satellite_info}
+
+        # 不在新列表中的卫星，以及需要重建的同名卫星，从场景中删除
+        for name, path in existing_satellites.items():
+            if name not in new_names or delete_duplicate_targets:
+                self._unload_object(path)
+
+        # 场景中已有且不要求重建的卫星直接保留，其余新建
+        satellites_to_create = [
+            sate
+            for sate in satellite_info
+            if delete_duplicate_targets or str(sate.name) not in existing_satellites
+        ]
 
         # 创建新的卫星
-        for sate in tqdm(satellite_info, desc="Adding satellites"):
-            satellite = self.scenario.Children.New(AgESTKObjectType["eSatellite"], str(sate.name))
-            # satellite.Graphics.LabelVisible = False
-
-            if hpop:
-                satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorHPOP)
-                satellite.Propagator.Step = 60
-                keplerian = satellite.Propagator.InitialState.Representation.ConvertTo(
-                    AgEOrbitStateType["eOrbitStateClassical"]
-                )
-                keplerian.SizeShapeType = AgEClassicalSizeShape["eSizeShapeSemimajorAxis"]
-                keplerian.LocationType = AgEClassicalLocation["eLocationMeanAnomaly"]
-                keplerian.Orientation.AscNodeType = AgEOrientationAscNode["eAscNodeRAAN"]
-
-                # Assign the perigee and apogee altitude values:
-                keplerian.SizeShape.SemiMajorAxis = sate.orbit_elements.semi_axis  # km
-                keplerian.SizeShape.Eccentricity = sate.orbit_elements.eccentricity  # km
-
-                # Assign the other desired orbital parameters:
-                keplerian.Orientation.Inclination = sate.orbit_elements.inclination  # deg
-                keplerian.Orientation.ArgOfPerigee = sate.orbit_elements.arg_of_perigee  # deg
-                keplerian.Orientation.AscNode.Value = sate.orbit_elements.raan  # deg
-                keplerian.Location.Value = sate.orbit_elements.mean_anomaly  # deg
-
-                # Apply the changes made to the satellite's state and propagate:
-                satellite.Propagator.InitialState.Representation.Assign(keplerian)
-
-                forceModel = satellite.Propagator.ForceModel
-                # 使用动态获取的STK安装路径
-                gravity_file = os.path.join(
-                    str(self.stk_install_path), "STKData", "CentralBodies", "Earth", "WGS84_EGM96.grv"
-                )
-                # hpop预设参数
-                forceModel.CentralBodyGravity.File = gravity_file
-                forceModel.CentralBodyGravity.MaxDegree = 21
-                forceModel.CentralBodyGravity.MaxOrder = 21
-                forceModel.Drag.Use = 1
-                forceModel.Drag.DragModel.Cd = 0.01
-                forceModel.Drag.DragModel.AreaMassRatio = 0.01
-                forceModel.SolarRadiationPressure.Use = 0
-
-                integrator = satellite.Propagator.Integrator
-                integrator.DoNotPropagateBelowAlt = -1e6
-                integrator.IntegrationModel = 3
-                integrator.StepSizeControl.Method = 1
-                integrator.StepSizeControl.ErrorTolerance = 1e-13
-                integrator.StepSizeControl.MinStepSize = 0.1
-                integrator.StepSizeControl.MaxStepSize = 30
-                integrator.Interpolation.Method = 1
-                integrator.Interpolation.Order = 7
-
-                satellite.Propagator.Propagate()
-            else:
-                # propagator = satellite.Propagator
-                # #  XPosition:float, YPosition:float, ZPosition:float, XVelocity:float, YVelocity:float, ZVelocity:float
-                # # 这里暂时不用，只使用六根数
-                # propagator.InitialState.Representation.AssignCartesian(
-                #     AgECoordinateSystem["eCoordinateSystemTrueOfDate"],
-                #     sate.position[0],
-                #     sate.position[1],
-                #     sate.position[2],
-                #     sate.velocity[0],
-                #     sate.velocity[1],
-                #     sate.velocity[2],
-                # )
-                # propagator.Propagate()
-                satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorJ2Perturbation)
-                keplerian = satellite.Propagator.InitialState.Representation.ConvertTo(
-                    AgEOrbitStateType["eOrbitStateClassical"]
+        # HPOP 的力模型与积分器配置对所有卫星相同，只在模板卫星上配置一次，之后每颗卫星复制模板再设置轨道根数
+        hpop_template = self._create_hpop_template() if hpop and satellites_to_create else None
+        # 初始状态的坐标系对所有新建卫星相同，只在第一颗卫星上读取一次
+        coordinate_system = None
+        try:
+            for sate in tqdm(satellites_to_create, desc="Adding satellites", mininterval=0.5):
+                if hpop:
+                    satellite = hpop_template.CopyObject(str(sate.name))
+                else:
+                    satellite = self.scenario.Children.New(_SATELLITE_TYPE, str(sate.name))
+                    # satellite.Graphics.LabelVisible = False
+
+                    # propagator = satellite.Propagator
+                    # #  XPosition:float, YPosition:float, ZPosition:float, XVelocity:float, YVelocity:float, ZVelocity:float
+                    # # 这里暂时不用，只使用六根数
+                    # propagator.InitialState.Representation.AssignCartesian(
+                    #     AgECoordinateSystem["eCoordinateSystemTrueOfDate"],
+                    #     sate.position[0],
+                    #     sate.position[1],
+                    #     sate.position[2],
+                    #     sate.velocity[0],
+                    #     sate.velocity[1],
+                    #     sate.velocity[2],
+                    # )
+                    # propagator.Propagate()
+                    satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorJ2Perturbation)
+
+                propagator = satellite.Propagator
+                representation = propagator.InitialState.Representation
+                if coordinate_system is None:
+                    # 沿用初始状态原有的坐标系，与先 ConvertTo 再逐项赋值的结果一致
+                    coordinate_system = representation.ConvertTo(_CLASSICAL_STATE).CoordinateSystemType
+
+                # 半长轴、偏心率、倾角、近地点幅角、升交点赤经、平近点角在一次调用中赋值，
+                # 不再逐项设置 ConvertTo 得到的经典根数对象后再 Assign
+                representation.AssignClassical(
+                    coordinate_system,
+                    sate.orbit_elements.semi_axis,  # km
+                    sate.orbit_elements.eccentricity,
+                    sate.orbit_elements.inclination,  # deg
+                    sate.orbit_elements.arg_of_perigee,  # deg
+                    sate.orbit_elements.raan,  # deg
+                    sate.orbit_elements.mean_anomaly,  # deg
                 )
-                keplerian.SizeShapeType = AgEClassicalSizeShape["eSizeShapeSemimajorAxis"]
-                keplerian.LocationType = AgEClassicalLocation["eLocationMeanAnomaly"]
-                keplerian.Orientation.AscNodeType = AgEOrientationAscNode["eAscNodeRAAN"]
-
-                # Assign the perigee and apogee altitude values:
-                keplerian.SizeShape.SemiMajorAxis = sate.orbit_elements.semi_axis  # km
-                keplerian.SizeShape.Eccentricity = sate.orbit_elements.eccentricity  # km
-
-                # Assign the other desired orbital parameters:
-                keplerian.Orientation.Inclination = sate.orbit_elements.inclination  # deg
-                keplerian.Orientation.ArgOfPerigee = sate.orbit_elements.arg_of_perigee  # deg
-                keplerian.Orientation.AscNode.Value = sate.orbit_elements.raan  # deg
-                keplerian.Location.Value = sate.orbit_elements.mean_anomaly  # deg
-
-                # Apply the changes made to the satellite's state and propagate:
-                satellite.Propagator.InitialState.Representation.Assign(keplerian)
-                satellite.Propagator.Propagate()
-
-            # show pass
-            passdata = satellite.Graphics.PassData
-            groundTrack = passdata.GroundTrack
-            groundTrack.SetLeadDataType(AgELeadTrailData["eDataAll"])
-            groundTrack.SetTrailSameAsLead()
+                propagator.Propagate()
+
+                # show pass
+                passdata = satellite.Graphics.PassData
+                groundTrack = passdata.GroundTrack
+                groundTrack.SetLeadDataType(_LEAD_DATA_ALL)
+                groundTrack.SetTrailSameAsLead()
+        finally:
+            # 模板只在本次创建期间存在，不出现在其他方法获取的卫星列表中
+            if hpop_template is not None:
+                hpop_template.Unload()
+
+    def _create_hpop_template(self):
+        """
+        创建配置好 HPOP 力模型与积分器的模板卫星，供 _add_satellite 复制
 
-        # 结束更新，打开界面显示
-        if not stk_sync_show:
-            self.root.EndUpdate()
+        Returns:
+            IAgStkObject: 模板卫星
+        """
+        template = self.scenario.Children.New(_SATELLITE_TYPE, self.HPOP_TEMPLATE_NAME)
+        template.SetPropagatorType(AgEVePropagatorType.ePropagatorHPOP)
+        template.Propagator.Step = 60
+
+        forceModel = template.Propagator.ForceModel
+        # 使用动态获取的STK安装路径
+        gravity_file = os.path.join(
+            str(self.stk_install_path), "STKData", "CentralBodies", "Earth", "WGS84_EGM96.grv"
+        )
+        # hpop预设参数
+        forceModel.CentralBodyGravity.File = gravity_file
+        forceModel.CentralBodyGravity.MaxDegree = 21
+        forceModel.CentralBodyGravity.MaxOrder = 21
+        forceModel.Drag.Use = 1
+        forceModel.Drag.DragModel.Cd = 0.01
+        forceModel.Drag.DragModel.AreaMassRatio = 0.01
+        forceModel.SolarRadiationPressure.Use = 0
+
+        integrator = template.Propagator.Integrator
+        integrator.DoNotPropagateBelowAlt = -1e6
+        integrator.IntegrationModel = 3
+        integrator.StepSizeControl.Method = 1
+        integrator.StepSizeControl.ErrorTolerance = 1e-13
+        integrator.StepSizeControl.MinStepSize = 0.1
+        integrator.StepSizeControl.MaxStepSize = 30
+        integrator.Interpolation.Method = 1
+        integrator.Interpolation.Order = 7
+        return template
 
     def add_sensor_attach_to_all_satellite(self, sensor_params, label_visible=True, stk_sync_show=True):
         """为所有卫星对象添加传感器。
@@ -850,23 +1070,37 @@ class STKConnector:
         """
         obj_type = "Satellite"
         obj_paths = self.get_objects(obj_type)
-        for path in tqdm(obj_paths, desc="Adding sensors"):
-            if path != "None":
-                _satellite = self.root.GetObjectFromPath(path)
-                # 检查卫星是否已有载荷
-                existing_sensors = self.get_objects("Sensor")
-                for sensor_path in existing_sensors:
-                    if sensor_path != "None" and path in sensor_path:
-                        # 如果找到该卫星的载荷，先删除
-                        sensor = self.root.GetObjectFromPath(sensor_path)
-                        sensor.Unload()
+        # 现有载荷列表只取一次，并按所属卫星路径分组，逐星处理时直接按路径查找
+        existing_sensors = {}
+        for sensor_path in self.get_objects("Sensor"):
+            if sensor_path != "None":
+                satellite_path = sensor_path.rsplit("/Sensor/", 1)[0]
+                existing_sensors.setdefault(satellite_path, []).append(sensor_path)
+        try:
+            self._add_sensors(obj_paths, existing_sensors, sensor_params)
+        finally:
+            self._scene_changed()
+
+    def _add_sensors(self, obj_paths: List[str], existing_sensors: Dict[str, List[str]], sensor_params):
+        """
+        add_sensor_attach_to_all_satellite 的实际创建逻辑
+        """
+        light_condition = AgECnstrLighting[sensor_params.light_condition]
+        with self._batch_graphics():
+            for path in tqdm(obj_paths, desc="Adding sensors", mininterval=0.5):
+                if path == "None":
+                    continue
+                _satellite = self._get_object(path)
+                # 如果该卫星已有载荷，先删除
+                for sensor_path in existing_sensors.get(path, ()):
+                    self._unload_object(sensor_path)
 
                 # 添加新的载荷
                 sensor_name = "MCP_Created_Sensor"
-                sensor = _satellite.Children.New(AgESTKObjectType["eSensor"], sensor_name)
+                sensor = _satellite.Children.New(_SENSOR_TYPE, sensor_name)
                 # def SetPatternSimpleConic(self, ConeAngle:typing.Any, AngularResolution:typing.Any) -> "IAgSnSimpleConicPattern":
                 # 半张角30°，角分辨率0.5°。
-                sensor.SetPatternType(AgESnPattern["eSnSimpleConic"])
+                sensor.SetPatternType(_SIMPLE_CONIC_PATTERN)
                 # todo 角分辨率默认0.5°
                 angular_resolution = 0.5
                 sensor.CommonTasks.SetPatternSimpleConic(
@@ -874,12 +1108,12 @@ class STKConnector:
                 )
                 # 可见性约束与之前介绍的卫星对象、地面站对象使用类似，这里只给个视线的例子
                 senConstraints = sensor.AccessConstraints
-                LOS = senConstraints.AddConstraint(AgEAccessConstraints["eCstrLOSSunExclusion"])
+                LOS = senConstraints.AddConstraint(_LOS_SUN_EXCLUSION_CONSTRAINT)
                 LOS.Angle = sensor_params.los_angle
 
                 # 添加光照条件约束
-                light = senConstraints.AddConstraint(AgEAccessConstraints["eCstrLighting"])
-                light.Condition = AgECnstrLighting[sensor_params.light_condition]
+                light = senConstraints.AddConstraint(_LIGHTING_CONSTRAINT)
+                light.Condition = light_condition
 
     def add_line_target(
         self,
@@ -906,43 +1140,48 @@ class STKConnector:
         # 关闭stk中的界面显示，提高添加点的性能
         if not stk_sync_show:
             self.root.BeginUpdate()
-        # delete all exists targets before insert new target
-        if delete_origin_targets:
-            self.delete_objects(obj_type="LineTarget", delete_all=True)
-
-        line_target = self.scenario.Children.New(AgESTKObjectType["eLine"], line_name)  # eLineTarget.
-        line_target.Graphics.Color = 16777215  # 白色
-        line_target.Graphics.LineWidth = 1.5  # 白色
-        for idx, point in enumerate(points):
-            line_target.Points.Add(point["latitude"], point["longitude"])
-
-            if echo:
-                print(
-                    f"\r Process: {idx / len(points) * 100:.2f}%, add Line Target,"
-                    f" Longitude={point['longitude']}, Latitude={point['latitude']}",
-                    end="",
-                )
+        try:
+            # delete all exists targets before insert new target
+            if delete_origin_targets:
+                self.delete_objects(obj_type="LineTarget", delete_all=True)
+
+            with self._batch_graphics():
+                line_target = self.scenario.Children.New(_LINE_TARGET_TYPE, line_name)
+                line_target.Graphics.Color = 16777215  # 白色
+                line_target.Graphics.LineWidth = 1.5  # 白色
+                # 进度由 tqdm 显示（echo 为 False 时关闭）
+                for point in tqdm(points, desc="Adding line points", disable=not echo, mininterval=0.5):
+                    line_target.Points.Add(point["latitude"], point["longitude"])
+        finally:
+            # 中途失败时已创建的线目标也要进入缓存
+            self._scene_changed()
+            # 结束更新，打开界面显示；创建中途出错也不能让界面一直停在暂停刷新状态
+            if not stk_sync_show:
+                self.root.EndUpdate()
 
         end_time = time.time()
         execution_time = end_time - start_time
 
-        # 结束更新，打开界面显示
-        if not stk_sync_show:
-            self.root.EndUpdate()
-
     def get_objects(self, obj_type: str) -> List:
         """
         获取STK中指定类型的所有对象名称列表。
 
         Args:
-            obj_type (str): 对象类型，如'Satellite'、'Target' 等。
+            obj_type (str | STKClass): 对象类型，如'Satellite'、'Target' 等，也可以是'eSatellite'。
 
         Returns:
             List[str]: 返回一个包含所有指定类型对象名称的字符串列表。
 
         """
-        obj_items = self.root.ExecuteCommand(f"ShowNames * Class {obj_type}")
-        return obj_items[0].strip().split(" ")
+        # 统一类名后再查缓存，'eSatellite' 与 'Satellite' 共用同一缓存项
+        obj_type = STKClass.from_stk(obj_type)
+        # 场景对象未增删时直接复用上次的结果，不再经 Connect 遍历对象树；缓存由 _scene_changed 清空
+        obj_paths = self._objects_cache.get(obj_type)
+        if obj_paths is None:
+            obj_items = self.root.ExecuteCommand(f"ShowNames * Class {obj_type}")
+            obj_paths = obj_items[0].strip().split(" ")
+            self._objects_cache[obj_type] = obj_paths
+        return list(obj_paths)
 
     def get_satellite_sensor(self) -> List:
         """
@@ -958,24 +1197,23 @@ class STKConnector:
                 - "full_path": 传感器的完整路径
 
         """
-        sensor_paths = self.get_objects("Sensor")
-        sensors_list = []
-        for path in sensor_paths:
-            # 分割路径以获取卫星和传感器的部分
-            parts = path.split("/")
-
-            # 假设卫星名称在'Satellite/'之后，紧接着的下一个部分
-            satellite_index = parts.index("Satellite") + 1
-            # 假设传感器名称在'Sensor/'之后，紧接着的下一个部分
-            sensor_index = parts.index("Sensor") + 1
-            sensors_list.append(
-                {
-                    "sensor": parts[sensor_index],
-                    "satellite": parts[satellite_index],
-                    "full_path": path,
-                }
-            )
-        return sensors_list
+        # 路径只在场景对象增删后重新解析，缓存由 _scene_changed 清空
+        if self._sensors_cache is None:
+            sensors_list = []
+            for path in self.get_objects("Sensor"):
+                if path == "None":
+                    continue
+                # 一次解析出路径中的卫星和传感器名称
+                path_parts = self._parse_path(path)
+                sensors_list.append(
+                    {
+                        "sensor": path_parts["Sensor"],
+                        "satellite": path_parts["Satellite"],
+                        "full_path": path,
+                    }
+                )
+            self._sensors_cache = sensors_list
+        return [dict(sensor) for sensor in self._sensors_cache]
 
     def delete_objects(self, obj_type: str, delete_all=False, obj_list=None, delay=0):
         """
@@ -989,29 +1227,28 @@ class STKConnector:
         Returns:
 
         """
-        if obj_type.startswith("e"):
-            obj_type = obj_type[1:]
+        obj_type = STKClass.from_stk(obj_type)
 
         if obj_list is None:
             obj_list = []
+        # 待删除对象的名称集合，逐个路径按名称精确查找
+        names_to_delete = {obj["name"] for obj in obj_list}
 
         obj_paths = self.get_objects(obj_type)
-        for path in obj_paths:
-            if path != "None":
-                if delete_all:
-                    target = self.root.GetObjectFromPath(path)
-                    target.Unload()
-                else:
-                    # 分割路径以获取卫星和传感器的部分
-                    parts = path.split("/")
-
-                    # 假设传感器名称在'obj_type/'之后，紧接着的下一个部分
-                    obj_name = parts[parts.index(obj_type) + 1]
-                    matches = [obj["name"] for obj in obj_list if obj["name"] == obj_name]
-                    if matches:
-                        target = self.root.GetObjectFromPath(path)
-                        target.Unload()
-                        time.sleep(delay)
+        try:
+            for path in obj_paths:
+                if path != "None":
+                    if delete_all:
+                        self._unload_object(path)
+                    else:
+                        # 从路径中取出 obj_type 对应的对象名称
+                        obj_name = self._parse_path(path)[obj_type]
+                        if obj_name in names_to_delete:
+                            self._unload_object(path)
+                            time.sleep(delay)
+        finally:
+            # 已删除对象的缓存句柄随之失效
+            self._scene_changed()
 
     def get_targets_to_satellites_access(
         self,
@@ -1053,101 +1290,77 @@ class STKConnector:
             self.root.BeginUpdate()
 
         # 根据卫星信息先计算这个卫星的最优gsd
-        gsd_info = {}
-        for sate in satellite_info:
-            min_range = sate.orbit_elements.semi_axis - self.earth_radius
-            max_elevation = 90 * math.pi / 180
-            gsd = round(sensor_info.gsd_factor * min_range / math.sqrt(math.sin(max_elevation)), 3)
-            gsd_info.update({sate.name: gsd})
+        # 最优情况下星下点观测，最大仰角为90°，gsd_factor * min_range / sqrt(sin(90°)) 中的分母恒为1
+        min_ranges = np.fromiter(
+            (sate.orbit_elements.semi_axis for sate in satellite_info), dtype=np.float64, count=len(satellite_info)
+        ) - self.earth_radius
+        gsds = np.round(sensor_info.gsd_factor * min_ranges, 3)
+        gsd_info = dict(zip((sate.name for sate in satellite_info), gsds.tolist()))
 
         # 计算卫星视场角对应的地面覆盖幅宽
-        propagation_data_ecef = self.get_satellite_ecef_by_time_shift(
-            start_time_shift=0,  # start_time_shift
-            period=12,
-            step=1,
-            ret_single_point=True,
-        )
-        imaging_swath = self.calculate_sensor_fov_imaging_swath(
-            sensor_info=sensor_info, satellite_ecef_data=propagation_data_ecef
-        )
-
-        # 计算对目标的可见性
-        # ic(target_list)
-        revisit_analysis_list: List[RevisitAnalysisInfo] = []
+        imaging_swath = self._imaging_swath(sensor_info)
 
         # 重置场景时间，计算可见性
         sensors_list = self.get_satellite_sensor()
         self.set_scenario_time_period(scenario_begin_time, scenario_end_time)
 
-        targets_path = {}
-        _targets_path = self.get_objects("Target")
-        # 找sensor对应的path
-        for path in _targets_path:
-            # 分割路径以获取卫星和传感器的部分
-            parts = path.split("/")
-            # 假设传感器名称在'obj_type/'之后，紧接着的下一个部分
-            obj_name = parts[parts.index("Target") + 1]
-            targets_path[obj_name] = path
+        # 目标名称 -> 目标路径
+        targets_path = {
+            self._parse_path(path)["Target"]: path for path in self.get_objects("Target") if path != "None"
+        }
 
         # 计算所有sensor对所有target的可见性
         # 目前仅支持一个卫星+一个传感器的组合情况
-        for i in range(len(target_list)):
-            for sensor in tqdm(sensors_list, desc="Processing revisit_analysis"):
-                revisit_analysis_list.append(
-                    RevisitAnalysisInfo(
-                        target=target_list[i],
-                        satellite_name=sensor["satellite"],
-                        imaging_swath=imaging_swath[sensor["satellite"]],
-                        access_events=self.compute_access(
-                            sensor, targets_path[target_list[i].target_name], sensor_info
-                        ),
+        # ComputeAccess 会为每个访问对象生成图形，批量模式下只在全部计算完成后刷新一次
+        # 传感器在外层循环，每个传感器的句柄只取一次；结果仍按 目标-传感器 的顺序存放
+        revisit_analysis_list: List[RevisitAnalysisInfo] = [None] * (len(target_list) * len(sensors_list))
+        target_objects = [self._get_object(targets_path[target.target_name]) for target in target_list]
+        with self._batch_graphics():
+            for j, sensor in enumerate(tqdm(sensors_list, desc="Processing revisit_analysis")):
+                to_sensor = self._get_object(sensor["full_path"])
+                satellite_name = sensor["satellite"]
+                for i, target in enumerate(target_list):
+                    access_events = self._compute_access(target_objects[i], to_sensor, sensor, sensor_info)
+                    # 访问事件算出后立即统计重访，直接构造完整的结果，不再对结果列表做第二遍遍历
+                    avg_revisit, max_revisit, min_revisit = self._revisit_statistics(access_events)
+                    revisit_analysis_list[i * len(sensors_list) + j] = RevisitAnalysisInfo(
+                        target=target,
+                        satellite_name=satellite_name,
+                        imaging_swath=imaging_swath[satellite_name],
+                        access_events=access_events,
                         revisit_epoch=revisit_epoch,
-                        gsd=gsd_info[sensor["satellite"]],
-                        avg_revisit=0.0,
-                        max_revisit=0.0,
-                        min_revisit=0.0,
+                        gsd=gsd_info[satellite_name],
+                        avg_revisit=avg_revisit,
+                        max_revisit=max_revisit,
+                        min_revisit=min_revisit,
                         revisit_time_unit="hour",
                         revisit_constraints=RevisitAnalysisConstraints(),
                     )
-                )
-
-        for idx, revisit_analysis in enumerate(revisit_analysis_list):
-            # 按 'start_time_dt' 排序
-            access_data = []
-            if revisit_analysis.access_events:
-                for access_event in revisit_analysis.access_events:
-                    access_data.append(access_event.__dict__)
-                access_data.sort(key=lambda _x: _x["start_timestamp"])
-
-            # 计算重访时间间隔
-            time_diffs = []
-
-            # 计算两次访问的时间间隔：本次的 start_time 减去上次的 end_time
-            for i in range(1, len(access_data)):
-                end_time_prev = access_data[i - 1]["end_timestamp"]
-                start_time_curr = access_data[i]["start_timestamp"]
-                # 计算时间间隔
-                time_diff = start_time_curr - end_time_prev  # 返回间隔的秒数
-                time_diffs.append(time_diff)
-
-            # 计算最大、最小和平均重访时间，单位s
-            try:
-                revisit_analysis_list[idx].avg_revisit = round(sum(time_diffs) / len(time_diffs) / 3600, 2)
-                revisit_analysis_list[idx].max_revisit = round(max(time_diffs) / 3600, 2)
-                revisit_analysis_list[idx].min_revisit = round(min(time_diffs) / 3600, 2)
-            except Exception as e:
-                print(f"计算重访出错，错误信息：{e}")
-                revisit_analysis_list[idx].avg_revisit = 99999
-                revisit_analysis_list[idx].max_revisit = 99999
-                revisit_analysis_list[idx].min_revisit = 99999
-            # 因为后面access_events就不用到了，为了便于查看结果，把access_events的冗余信息去掉
-            # revisit_analysis.access_events = None
 
         # 结束更新，打开界面显示
         if not stk_sync_show:
             self.root.EndUpdate()
         return revisit_analysis_list
 
+    @staticmethod
+    def _revisit_statistics(access_events: List[STKAccessEvent]) -> Tuple[float, float, float]:
+        """
+        根据访问事件计算平均、最大、最小重访时间（小时），不足两次访问时无法计算重访，均返回99999
+        """
+        starts = np.fromiter((e.start_timestamp for e in access_events), dtype=np.int64, count=len(access_events))
+        ends = np.fromiter((e.end_timestamp for e in access_events), dtype=np.int64, count=len(access_events))
+        # 按开始时间排序
+        order = np.argsort(starts, kind="stable")
+        # 计算两次访问的时间间隔：本次的 start_time 减去上次的 end_time，单位s
+        time_diffs = starts[order][1:] - ends[order][:-1]
+        if not time_diffs.size:
+            return 99999, 99999, 99999
+        return (
+            round(float(time_diffs.mean()) / 3600, 2),
+            round(float(time_diffs.max()) / 3600, 2),
+            round(float(time_diffs.min()) / 3600, 2),
+        )
+
     def compute_access(
         self, sensor_path: dict, target_path: str, sensor_info: PayloadInfo
     ) -> List[STKAccessEvent]:
@@ -1173,10 +1386,18 @@ class STKConnector:
                 max_elevation: float
                 min_range: float
         """
-        access_list = []
-        from_target = self.root.GetObjectFromPath(target_path)
-        to_sensor = self.root.GetObjectFromPath(sensor_path["full_path"])
+        # 每个目标、传感器会与多个对象计算可见性，句柄从缓存中取
+        return self._compute_access(
+            self._get_object(target_path), self._get_object(sensor_path["full_path"]), sensor_path, sensor_info
+        )
 
+    def _compute_access(
+        self, from_target, to_sensor, sensor_path: dict, sensor_info: PayloadInfo
+    ) -> List[STKAccessEvent]:
+        """
+        compute_access 的实际计算逻辑，目标与传感器句柄由调用方预先取好
+        """
+        access_list = []
         access = from_target.GetAccessToObject(to_sensor)
 
         # Compute access
@@ -1186,21 +1407,18 @@ class STKConnector:
         # 如果有可见弧段，则计算可见的elevation以及range，并计算gsd
         if access_intervals.Count:
             access_intervals_time_cell = access_intervals.ToArray(0, -1)
+            # 同一 access 的各弧段共用一个 DataProvider 句柄，不再逐弧段经 COM 逐级解析
+            aer_data_provider = access.DataProviders.Item("AER Data").Group.Item("VVLH CBF")
 
             for time_cell in access_intervals_time_cell:
-                access_aer = (
-                    access.DataProviders.Item("AER Data")
-                    .Group.Item("VVLH CBF")
-                    .Exec(time_cell[0], time_cell[1], 5)
-                )
-                max_elevation = max(access_aer.DataSets.GetDataSetByName("Elevation").GetValues())
-                min_range = min(access_aer.DataSets.GetDataSetByName("Range").GetValues())
+                # 只请求仰角与距离两个数据元素
+                access_aer = aer_data_provider.ExecElements(time_cell[0], time_cell[1], 5, self.AER_ELEMENTS)
+                elevations = np.asarray(access_aer.DataSets.GetDataSetByName("Elevation").GetValues(), dtype=np.float64)
+                ranges = np.asarray(access_aer.DataSets.GetDataSetByName("Range").GetValues(), dtype=np.float64)
 
                 # compute the GSD   *地面采样距离，较小的 GSD 表示更高的分辨率
-                gsd = round(
-                    sensor_info.gsd_factor * min_range / math.sqrt(math.sin(Tools.deg2rad(max_elevation))),
-                    3,
-                )
+                max_elevation, min_range, gsd = pass_gsd(elevations, ranges, sensor_info.gsd_factor)
+                gsd = round(gsd, 3)
 
                 access_list.append(
                     STKAccessEvent(
@@ -1227,30 +1445,36 @@ class STKConnector:
             Dict[str, List[Tuple[str, str, float]]]:
                 键为"卫星A-卫星B"，值为可见弧段的(开始时间, 结束时间, 持续时长(秒))元组列表。
         """
-        paths = self.get_objects("Satellite")
+        # 每颗卫星的对象句柄与名称只解析一次，两两组合时直接复用
+        satellites = [self._get_object(path) for path in self.get_objects("Satellite") if path != "None"]
+        names = [satellite.InstanceName for satellite in satellites]
         result = {}
-        total = (len(paths) * (len(paths) - 1)) // 2
+        total = (len(satellites) * (len(satellites) - 1)) // 2
         with tqdm(total=total, desc="卫星两两可见性计算") as pbar:
-            for i in range(len(paths)):
-                for j in range(i + 1, len(paths)):
-                    sat_a = self.root.GetObjectFromPath(paths[i])
-                    sat_b = self.root.GetObjectFromPath(paths[j])
-                    access = sat_a.GetAccessToObject(sat_b)
-                    access.ComputeAccess()
-                    intervals = access.ComputedAccessIntervalTimes
-                    key = f"{sat_a.InstanceName}-{sat_b.InstanceName}"
-                    result[key] = []
-                    if intervals.Count:
-                        for t0, t1 in intervals.ToArray(0, -1):
-                            # 将时间字符串转换为datetime对象
-                            t0_dt = datetime.datetime.strptime(t0, "%d %b %Y %H:%M:%S.%f")
-                            t1_dt = datetime.datetime.strptime(t1, "%d %b %Y %H:%M:%S.%f")
-                            # 计算持续时长（秒）
-                            duration = (t1_dt - t0_dt).total_seconds()
-                            result[key].append((t0, t1, duration))
+            for i in range(len(satellites)):
+                for j in range(i + 1, len(satellites)):
+                    result[f"{names[i]}-{names[j]}"] = self._access_intervals(satellites[i], satellites[j])
                     pbar.update(1)
         return result
 
+    def _access_intervals(self, from_obj, to_obj) -> List[Tuple[str, str, float]]:
+        """
+        计算两个对象之间的可见性，返回可见弧段的(开始时间, 结束时间, 持续时长(秒))元组列表
+        """
+        access = from_obj.GetAccessToObject(to_obj)
+        access.ComputeAccess()
+        intervals = access.ComputedAccessIntervalTimes
+        if not intervals.Count:
+            return []
+        interval_times = intervals.ToArray(0, -1)
+        starts = [row[0] for row in interval_times]
+        ends = [row[1] for row in interval_times]
+        # 整列解析时间字符串，计算持续时长（秒）
+        durations = (
+            pd.to_datetime(ends, format=self.UTCG_FORMAT) - pd.to_datetime(starts, format=self.UTCG_FORMAT)
+        ).total_seconds()
+        return list(zip(starts, ends, durations.tolist()))
+
     def get_satellites_to_missiles_access(self) -> Dict[str, List[Tuple[str, str, float]]]:
         """
         计算所有卫星传感器对目标的可见性。
@@ -1261,32 +1485,23 @@ class STKConnector:
         """
         # 获取所有卫星的传感器
         sensors_list = self.get_satellite_sensor()
-        tgt_paths = self.get_objects("Missile")
+        tgt_paths = [path for path in self.get_objects("Missile") if path != "None"]
+        # 导弹对象句柄与名称只解析一次，不再随传感器数量重复查询
+        targets = {path: self._get_object(path) for path in tgt_paths}
+        target_names = {path: tgt.InstanceName for path, tgt in targets.items()}
         result = {}
         total = len(sensors_list) * len(tgt_paths)
         with tqdm(total=total, desc="卫星传感器对目标可见性计算") as pbar:
             for sensor_info in sensors_list:
                 if sensor_info["full_path"] == "None":
                     continue
-                sensor = self.root.GetObjectFromPath(sensor_info["full_path"])
+                sensor = self._get_object(sensor_info["full_path"])
                 for tgt_path in tgt_paths:
-                    if tgt_path == "None":
-                        continue
                     try:
-                        tgt = self.root.GetObjectFromPath(tgt_path)
-                        access = tgt.GetAccessToObject(sensor)
-                        access.ComputeAccess()
-                        intervals = access.ComputedAccessIntervalTimes
-                        key = f"{sensor_info['satellite']}-{tgt.InstanceName}"
+                        key = f"{sensor_info['satellite']}-{target_names[tgt_path]}"
+                        # 先占位，计算出错时该组合仍以空列表出现在结果中
                         result[key] = []
-                        if intervals.Count:
-                            for t0, t1 in intervals.ToArray(0, -1):
-                                # 将时间字符串转换为datetime对象
-                                t0_dt = datetime.datetime.strptime(t0, "%d %b %Y %H:%M:%S.%f")
-                                t1_dt = datetime.datetime.strptime(t1, "%d %b %Y %H:%M:%S.%f")
-                                # 计算持续时长（秒）
-                                duration = (t1_dt - t0_dt).total_seconds()
-                                result[key].append((t0, t1, duration))
+                        result[key] = self._access_intervals(targets[tgt_path], sensor)
                     except Exception as e:
                         print(f"处理目标 {tgt_path} 时出错: {str(e)}")
                         continue
@@ -1319,10 +1534,12 @@ class STKConnector:
         """
         paths = self.get_objects("Missile")
         resp = {}
+        orbit_begin_time = Tools.get_date_string_by_timestamp(self._scenario_begin_ms + start_time_shift)
+        orbit_end_time = Tools.get_date_string_by_timestamp(self._scenario_begin_ms + start_time_shift + period)
         for path in paths:
             if path == "None":
                 continue
-            missile = self.root.GetObjectFromPath(path)
+            missile = self._get_object(path)
             missile_name = missile.InstanceName
             
             # 如果指定了instance_names，只处理指定的导弹
@@ -1330,33 +1547,9 @@ class STKConnector:
                 # print(f"跳过missile: {missile_name}")
                 continue
                 
-            print(f"处理missile: {missile_name}")
-            orbit_begin_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift
+            # 与卫星ECEF相同，时间字符串整批规整、坐标整体四舍五入，不再逐点解析、格式化
+            times, xyz = self._position_arrays(
+                path, "Cartesian Position", self.ECEF_ELEMENTS, orbit_begin_time, orbit_end_time, step, ret_single_point
             )
-            orbit_end_time = Tools.get_date_string_by_timestamp(
-                Tools.get_ms_timestamp_by_date_string(self.scenario_begin_time) + start_time_shift + period
-            )
-            ic(orbit_begin_time, orbit_end_time)
-            missileDP = missile.DataProviders.Item("Cartesian Position").Group.Item("Fixed")
-            result = missileDP.Exec(orbit_begin_time, orbit_end_time, step)
-            times = result.DataSets.GetDataSetByName("Time").GetValues()
-            x_pos = result.DataSets.GetDataSetByName("x").GetValues()
-            y_pos = result.DataSets.GetDataSetByName("y").GetValues()
-            z_pos = result.DataSets.GetDataSetByName("z").GetValues()
-            _temp = []
-            ic(_temp)
-            for t, x, y, z in zip(times, x_pos, y_pos, z_pos):
-                _temp.append(
-                    (
-                        Tools.get_date_string_by_timestamp(Tools.get_ms_timestamp_by_date_string(t)),
-                        round(x, 3),
-                        round(y, 3),
-                        round(z, 3),
-                    )
-                )
-                if ret_single_point:
-                    break
-            resp.update({missile_name: _temp})
-            ic(resp)
+            resp.update({missile_name: list(zip(times, *xyz.T.tolist()))})
         return resp
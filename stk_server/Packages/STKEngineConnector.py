@@ -91,6 +91,8 @@ class STKEngineConnector:
         print("Creating scenario...")
         self.stk_root.NewScenario("MCP_Created_Scenario")
         self.scenario = self.stk_root.CurrentScenario
+        # get_objects 的结果按对象类型缓存，增删对象后清空
+        self._objects_cache = {}
 
         if not useStkEngine:
             # Graphics calls are not available when running STK Engine in NoGraphics mode
@@ -150,53 +152,57 @@ class STKEngineConnector:
         # 关闭stk中的界面显示，提高添加点的性能
         if not stk_sync_show:
             self.stk_root.BeginUpdate()
-        # delete all exists targets before insert new satellite
-        if delete_origin_targets:
-            self.delete_objects(obj_type="Satellite", delete_all=True)
-
-        satellite = self.scenario.Children.New(AgESTKObjectType.eSatellite, str(satellite_info['name']))
-        satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorJ2Perturbation)
-        # satellite.Graphics.LabelVisible = False
-
-        if classsic_elements:
-            # @todo 现在设置轨道参数有点问题，应该是使用TrueOfDate,这个设置出来是ICRF
-            # Get orbit state
-            keplerian = satellite.Propagator.InitialState.Representation.ConvertTo(
-                AgEOrbitStateType['eOrbitStateClassical'])
-            keplerian.SizeShapeType = AgEClassicalSizeShape['eSizeShapeSemimajorAxis']
-            keplerian.LocationType = AgEClassicalLocation['eLocationMeanAnomaly']
-            keplerian.Orientation.AscNodeType = AgEOrientationAscNode['eAscNodeRAAN']
-
-            # Assign the perigee and apogee altitude values:
-            keplerian.SizeShape.SemiMajorAxis = satellite_info['orbit_elements']['semi_axis']  # km
-            keplerian.SizeShape.Eccentricity = satellite_info['orbit_elements']['eccentricity']  # km
-
-            # Assign the other desired orbital parameters:
-            keplerian.Orientation.Inclination = satellite_info['orbit_elements']['inclination']  # deg
-            keplerian.Orientation.ArgOfPerigee = satellite_info['orbit_elements']['arg_of_perigee']  # deg
-            keplerian.Orientation.AscNode.Value = satellite_info['orbit_elements']['raan']  # deg
-            keplerian.Location.Value = satellite_info['orbit_elements']['mean_anomaly']  # deg
-
-            # Apply the changes made to the satellite's state and propagate:
-            satellite.Propagator.InitialState.Representation.Assign(keplerian)
-            satellite.Propagator.Propagate()
-        else:
-            propagator = satellite.Propagator
-            #  XPosition:float, YPosition:float, ZPosition:float, XVelocity:float, YVelocity:float, ZVelocity:float
-            propagator.InitialState.Representation.AssignCartesian(
-                AgECoordinateSystem['eCoordinateSystemTrueOfDate'],
-                satellite_info['position'][0], satellite_info['position'][1],
-                satellite_info['position'][2], satellite_info['velocity'][0],
-                satellite_info['velocity'][1], satellite_info['velocity'][2])
-            propagator.Propagate()
-
-        # show pass
-        passdata = satellite.Graphics.PassData
-        groundTrack = passdata.GroundTrack
-        groundTrack.SetLeadDataType(AgELeadTrailData['eDataAll'])
-        groundTrack.SetTrailSameAsLead()
-        if not stk_sync_show:
-            self.stk_root.EndUpdate()
+        try:
+            # delete all exists targets before insert new satellite
+            if delete_origin_targets:
+                self.delete_objects(obj_type="Satellite", delete_all=True)
+
+            satellite = self.scenario.Children.New(AgESTKObjectType.eSatellite, str(satellite_info['name']))
+            satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorJ2Perturbation)
+            # satellite.Graphics.LabelVisible = False
+
+            if classsic_elements:
+                # @todo 现在设置轨道参数有点问题，应该是使用TrueOfDate,这个设置出来是ICRF
+                # Get orbit state
+                keplerian = satellite.Propagator.InitialState.Representation.ConvertTo(
+                    AgEOrbitStateType['eOrbitStateClassical'])
+                keplerian.SizeShapeType = AgEClassicalSizeShape['eSizeShapeSemimajorAxis']
+                keplerian.LocationType = AgEClassicalLocation['eLocationMeanAnomaly']
+                keplerian.Orientation.AscNodeType = AgEOrientationAscNode['eAscNodeRAAN']
+
+                # Assign the perigee and apogee altitude values:
+                keplerian.SizeShape.SemiMajorAxis = satellite_info['orbit_elements']['semi_axis']  # km
+                keplerian.SizeShape.Eccentricity = satellite_info['orbit_elements']['eccentricity']  # km
+
+                # Assign the other desired orbital parameters:
+                keplerian.Orientation.Inclination = satellite_info['orbit_elements']['inclination']  # deg
+                keplerian.Orientation.ArgOfPerigee = satellite_info['orbit_elements']['arg_of_perigee']  # deg
+                keplerian.Orientation.AscNode.Value = satellite_info['orbit_elements']['raan']  # deg
+                keplerian.Location.Value = satellite_info['orbit_elements']['mean_anomaly']  # deg
+
+                # Apply the changes made to the satellite's state and propagate:
+                satellite.Propagator.InitialState.Representation.Assign(keplerian)
+                satellite.Propagator.Propagate()
+            else:
+                propagator = satellite.Propagator
+                #  XPosition:float, YPosition:float, ZPosition:float, XVelocity:float, YVelocity:float, ZVelocity:float
+                propagator.InitialState.Representation.AssignCartesian(
+                    AgECoordinateSystem['eCoordinateSystemTrueOfDate'],
+                    satellite_info['position'][0], satellite_info['position'][1],
+                    satellite_info['position'][2], satellite_info['velocity'][0],
+                    satellite_info['velocity'][1], satellite_info['velocity'][2])
+                propagator.Propagate()
+
+            # show pass
+            passdata = satellite.Graphics.PassData
+            groundTrack = passdata.GroundTrack
+            groundTrack.SetLeadDataType(AgELeadTrailData['eDataAll'])
+            groundTrack.SetTrailSameAsLead()
+        finally:
+            # 中途失败也要恢复界面刷新；卫星可能已创建或原有卫星已被删除，缓存一律失效
+            if not stk_sync_show:
+                self.stk_root.EndUpdate()
+            self._objects_cache.clear()
 
         end_time = time.time()
         execution_time = end_time - start_time
@@ -220,22 +226,26 @@ class STKEngineConnector:
             obj_list = []
 
         obj_paths = self.get_objects(obj_type)
-        for path in obj_paths:
-            if path != 'None':
-                if delete_all:
-                    target = self.stk_root.GetObjectFromPath(path)
-                    target.Unload()
-                else:
-                    # 分割路径以获取卫星和传感器的部分
-                    parts = path.split('/')
-
-                    # 假设传感器名称在'obj_type/'之后，紧接着的下一个部分
-                    obj_name = parts[parts.index(obj_type) + 1]
-                    matches = [obj["name"] for obj in obj_list if obj["name"] == obj_name]
-                    if matches:
+        try:
+            for path in obj_paths:
+                if path != 'None':
+                    if delete_all:
                         target = self.stk_root.GetObjectFromPath(path)
                         target.Unload()
-                        time.sleep(delay)
+                    else:
+                        # 分割路径以获取卫星和传感器的部分
+                        parts = path.split('/')
+
+                        # 假设传感器名称在'obj_type/'之后，紧接着的下一个部分
+                        obj_name = parts[parts.index(obj_type) + 1]
+                        matches = [obj["name"] for obj in obj_list if obj["name"] == obj_name]
+                        if matches:
+                            target = self.stk_root.GetObjectFromPath(path)
+                            target.Unload()
+                            time.sleep(delay)
+        finally:
+            # 卸载对象时其子对象一并消失，所有类型的缓存都需失效
+            self._objects_cache.clear()
 
     def get_objects(self, obj_type: str) -> List:
         """
@@ -248,8 +258,13 @@ class STKEngineConnector:
             List[str]: 返回一个包含所有指定类型对象名称的字符串列表。
 
         """
-        obj_items = self.stk_root.ExecuteCommand(f'ShowNames * Class {obj_type}')
-        return obj_items[0].strip().split(' ')
+        # 场景对象未增删时直接复用上次的结果，不再经 Connect 遍历对象树
+        obj_paths = self._objects_cache.get(obj_type)
+        if obj_paths is None:
+            obj_items = self.stk_root.ExecuteCommand(f'ShowNames * Class {obj_type}')
+            obj_paths = obj_items[0].strip().split(' ')
+            self._objects_cache[obj_type] = obj_paths
+        return list(obj_paths)
 
     def get_sun_beta(self, scenario_begin_time, scenario_end_time):
         """计算卫星的太阳beta角。
@@ -9,6 +9,8 @@ import math
 import time
 from datetime import datetime
 
+import numpy as np
+
 # import pyproj
 import icecream
 import matplotlib.pyplot as plt
@@ -186,3 +188,25 @@ def get_date_string_by_timestamp(timestamp: float):
     dt_obj = datetime.fromtimestamp(timestamp)
     formatted_time = dt_obj.strftime("%d %b %Y %H:%M:%S.%f")[:-3]
     return formatted_time
+
+
+def normalize_date_strings(date_strings):
+    """
+    批量将STK的场景时间规整为毫秒精度的统一格式
+    结果与逐个调用 get_date_string_by_timestamp(get_ms_timestamp_by_date_string(t)) 相同，
+    但整批只做数组化的字符串切分与补齐，不再逐个解析、格式化
+    Args:
+        date_strings: STK的场景时间序列，如：['1 May 2024 04:00:00.000123', ...]
+
+    Returns:
+        ['01 May 2024 04:00:00.000', ...]
+    """
+    if len(date_strings) == 0:
+        return []
+    date_strings = np.asarray(date_strings, dtype=str)
+    base, _, fraction = np.char.partition(date_strings, ".").T
+    # 日期中的日补齐为两位，与 strftime 的 %d 一致
+    day, _, rest = np.char.partition(base, " ").T
+    # 小数部分右补零后截取前三位（毫秒），与原实现的截断一致
+    ms = np.char.ljust(fraction, 3, "0").astype("<U3")
+    return np.char.add(np.char.add(np.char.add(np.char.zfill(day, 2), " "), rest), np.char.add(".", ms)).tolist()
@@ -0,0 +1,51 @@
+"""可见性计算中对每个访问弧段都会重复执行的数值计算
+
+安装了 numba 时以 @njit(cache=True) 编译为机器码（cache=True 使重启服务时无需重新编译），
+未安装时退化为等价的 NumPy 实现。
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def pass_gsd(elevations, ranges, gsd_factor):
+        """根据一个访问弧段内的仰角、距离序列计算最大仰角、最小距离以及对应的GSD
+        Args:
+            elevations (np.ndarray): 弧段内各采样点的仰角（°），float64
+            ranges (np.ndarray): 弧段内各采样点的距离（km），float64
+            gsd_factor (float): 载荷的GSD系数
+        Returns:
+            tuple[float, float, float]: 最大仰角（°）、最小距离（km）、GSD
+        """
+        max_elevation = elevations[0]
+        for i in range(1, elevations.shape[0]):
+            if elevations[i] > max_elevation:
+                max_elevation = elevations[i]
+        min_range = ranges[0]
+        for i in range(1, ranges.shape[0]):
+            if ranges[i] < min_range:
+                min_range = ranges[i]
+        gsd = gsd_factor * min_range / math.sqrt(math.sin(max_elevation * math.pi / 180))
+        return max_elevation, min_range, gsd
+else:
+    def pass_gsd(elevations, ranges, gsd_factor):
+        """根据一个访问弧段内的仰角、距离序列计算最大仰角、最小距离以及对应的GSD
+        Args:
+            elevations (np.ndarray): 弧段内各采样点的仰角（°），float64
+            ranges (np.ndarray): 弧段内各采样点的距离（km），float64
+            gsd_factor (float): 载荷的GSD系数
+        Returns:
+            tuple[float, float, float]: 最大仰角（°）、最小距离（km）、GSD
+        """
+        max_elevation = float(elevations.max())
+        min_range = float(ranges.min())
+        gsd = gsd_factor * min_range / math.sqrt(math.sin(max_elevation * math.pi / 180))
+        return max_elevation, min_range, gsd
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+卫星网络布局测试脚本
+"""
+
+import networkx as nx
+import numpy as np
+from regular_algrithoms.data_visualizatoin import fr_lbfgs_layout
+
+
+def test_fr_lbfgs_layout_disconnected_cliques():
+    """两个互不相连的卫星团：布局应保持有限，且两团及团内节点都不被压缩成一点"""
+    G = nx.disjoint_union(nx.complete_graph(5), nx.complete_graph(5))
+    nx.set_edge_attributes(G, 1.0, 'weight')
+    nodelist = list(G.nodes)
+    pos_init = np.random.default_rng(0).uniform(-100, 100, size=(len(nodelist), 2))
+
+    pos = fr_lbfgs_layout(G, nodelist, pos_init, k=400)
+
+    assert pos.shape == (len(nodelist), 2)
+    assert np.isfinite(pos).all()
+    # 团内节点的间距不能因另一团被推远而在缩放后趋于0
+    for clique in (pos[:5], pos[5:]):
+        spread = np.linalg.norm(clique - clique.mean(axis=0), axis=1).max()
+        assert spread > 0.01
+    # 两团中心分开
+    assert np.linalg.norm(pos[:5].mean(axis=0) - pos[5:].mean(axis=0)) > 0.1
+
+
+if __name__ == "__main__":
+    test_fr_lbfgs_layout_disconnected_cliques()
+    print("测试通过")